@@ -10,16 +10,22 @@ from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
-# Page configuration
-st.set_page_config(
+# Page configuration - kwargs built once at import time. Both this call
+# and the CSS injection below must still run on every rerun: Streamlit
+# re-executes the script per interaction and falls back to defaults for
+# any page config or element a rerun does not re-emit, so a
+# session_state "run once" gate would reset the layout and styling.
+_PAGE_CONFIG = dict(
     page_title=Config.PAGE_TITLE,
     page_icon=Config.PAGE_ICON,
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+st.set_page_config(**_PAGE_CONFIG)
+
+# Custom CSS - static string, injected once per session
+_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -41,13 +47,55 @@ st.markdown("""
         box-shadow: 0 2px 4px rgba(0,0,0,0.1);
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# Note: this must run on every rerun - Streamlit removes elements that a
+# rerun does not re-emit, so gating the injection behind session_state
+# would unstyle the page after the first interaction
+st.markdown(_CSS, unsafe_allow_html=True)
+
+# Header HTML built once at import time rather than re-formatted on every rerun
+HEADER_HTML = f'<h1 class="main-header">{Config.PAGE_ICON} {Config.PAGE_TITLE}</h1>'
+
+
+@st.cache_data(ttl=60)
+def _now_str(fmt: str = '%Y-%m-%d %H:%M:%S'):
+    """Minute-resolution timestamp, cached so reruns skip the strftime call"""
+    return datetime.now().strftime(fmt)
+
+
+@st.cache_data(ttl=Config.CACHE_TTL)
+def _quick_stats():
+    """Fetch landing-page stats once per TTL instead of on every rerun"""
+    from src.database.db_manager import db_manager
+
+    stats_query = """
+        SELECT
+            (SELECT COUNT(*) FROM customers) as total_customers,
+            (SELECT COUNT(*) FROM orders) as total_orders,
+            (SELECT COALESCE(SUM(total_amount), 0) FROM orders) as total_revenue
+    """
+    stats_result = db_manager.execute_query(stats_query)
+    stats = stats_result[0] if stats_result else {}
+
+    total_customers = stats.get('total_customers', 0)
+    total_orders = stats.get('total_orders', 0)
+    total_revenue = stats.get('total_revenue', 0)
+    avg_order = total_revenue / total_orders if total_orders > 0 else 0
+
+    return {
+        'total_customers': total_customers,
+        'total_orders': total_orders,
+        'total_revenue': total_revenue,
+        'avg_order': avg_order
+    }
+
 
 def main():
     """Main application"""
     
     # Header
-    st.markdown(f'<h1 class="main-header">{Config.PAGE_ICON} {Config.PAGE_TITLE}</h1>', unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar
     with st.sidebar:
@@ -77,7 +125,7 @@ def main():
         st.markdown("### 📈 About")
         st.caption(f"""
         **Version:** 1.0  
-        **Last Updated:** {datetime.now().strftime('%Y-%m-%d')}  
+        **Last Updated:** {_now_str('%Y-%m-%d')}  
         **Data Source:** MySQL Database
         """)
     
@@ -98,44 +146,31 @@ def main():
     st.markdown("---")
     
     # Quick stats
-    st.markdown("## 📊 Quick Stats")
-    
-    from src.database.db_manager import db_manager
-    
+    col1, col2 = st.columns([6, 1])
+    with col1:
+        st.markdown("## 📊 Quick Stats")
+    with col2:
+        if st.button("🔄 Refresh stats"):
+            _quick_stats.clear()
+
     try:
-        # Get total customers
-        customer_count_query = "SELECT COUNT(*) as count FROM customers"
-        customer_result = db_manager.execute_query(customer_count_query)
-        total_customers = customer_result[0]['count'] if customer_result else 0
-        
-        # Get total orders
-        order_count_query = "SELECT COUNT(*) as count FROM orders"
-        order_result = db_manager.execute_query(order_count_query)
-        total_orders = order_result[0]['count'] if order_result else 0
-        
-        # Get total revenue
-        revenue_query = "SELECT SUM(total_amount) as total FROM orders"
-        revenue_result = db_manager.execute_query(revenue_query)
-        total_revenue = revenue_result[0]['total'] if revenue_result and revenue_result[0]['total'] else 0
-        
-        # Get average order value
-        avg_order = total_revenue / total_orders if total_orders > 0 else 0
-        
+        stats = _quick_stats()
+
         # Display metrics
         col1, col2, col3, col4 = st.columns(4)
-        
+
         with col1:
-            st.metric("👥 Total Customers", f"{total_customers:,}")
-        
+            st.metric("👥 Total Customers", f"{stats['total_customers']:,}")
+
         with col2:
-            st.metric("📦 Total Orders", f"{total_orders:,}")
-        
+            st.metric("📦 Total Orders", f"{stats['total_orders']:,}")
+
         with col3:
-            st.metric("💰 Total Revenue", f"₹{total_revenue:,.2f}")
-        
+            st.metric("💰 Total Revenue", f"₹{stats['total_revenue']:,.2f}")
+
         with col4:
-            st.metric("📊 Avg Order Value", f"₹{avg_order:,.2f}")
-        
+            st.metric("📊 Avg Order Value", f"₹{stats['avg_order']:,.2f}")
+
     except Exception as e:
         st.error(f"Error loading quick stats: {e}")
         logger.error(f"Error in main page quick stats: {e}")
@@ -5,8 +5,11 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process - every Streamlit page imports
+# this module, so guard against re-parsing the .env file on each import
+if not os.environ.get('_AKASA_DOTENV_LOADED'):
+    load_dotenv()
+    os.environ['_AKASA_DOTENV_LOADED'] = '1'
 
 class Config:
     """Application configuration"""
@@ -26,9 +29,13 @@ class Config:
         'user': os.getenv('DB_USER', 'akasa_user'),
         'password': os.getenv('DB_PASSWORD', 'akasa_pass'),
         'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
-        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
-        'pool_recycle': 3600,
-        'pool_pre_ping': True
+        # Off by default: the dashboard only runs SELECTs and plain
+        # INSERT/DELETE batches, so there is no session state (user vars,
+        # temp tables) to reset, and skipping the reset saves one RTT per
+        # connection return
+        'pool_reset_session': os.getenv('DB_POOL_RESET_SESSION', 'false').lower() == 'true',
+        # Required for LOAD DATA LOCAL INFILE bulk loads
+        'allow_local_infile': os.getenv('DB_ALLOW_LOCAL_INFILE', 'true').lower() == 'true'
     }
     
     # Application settings
@@ -58,14 +65,9 @@ class Config:
         cls.RAW_DATA_DIR.mkdir(exist_ok=True)
         cls.PROCESSED_DATA_DIR.mkdir(exist_ok=True)
         cls.LOG_DIR.mkdir(exist_ok=True)
-    
-    @classmethod
-    def get_database_url(cls):
-        """Get SQLAlchemy database URL"""
-        return (
-            f"mysql+pymysql://{cls.DB_CONFIG['user']}:{cls.DB_CONFIG['password']}"
-            f"@{cls.DB_CONFIG['host']}:{cls.DB_CONFIG['port']}/{cls.DB_CONFIG['database']}"
-        )
 
-# Initialize directories on import
-Config.ensure_directories()
\ No newline at end of file
+# Initialize directories once per process (mkdir stats the path even with
+# exist_ok=True, so skip it on repeat imports)
+if not os.environ.get('_AKASA_DIRS_READY'):
+    Config.ensure_directories()
+    os.environ['_AKASA_DIRS_READY'] = '1'
\ No newline at end of file
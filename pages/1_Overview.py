@@ -3,13 +3,12 @@ Overview Dashboard - Main analytics view
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from config.config import Config
 from src.database.db_manager import db_manager
-from src.kpis.table_based_kpis import table_kpi_engine
+from src.kpis.table_based_kpis import get_table_engine
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -20,6 +19,12 @@ st.set_page_config(
     layout="wide"
 )
 
+
+@st.cache_data(ttl=60)
+def _now_str():
+    """Minute-resolution timestamp, cached so reruns skip the strftime call"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
 st.title("📊 Overview Dashboard")
 st.markdown("Real-time view of key business metrics and trends")
 
@@ -36,37 +41,54 @@ st.markdown("---")
 # Load data
 @st.cache_data(ttl=Config.CACHE_TTL)
 def load_overview_data():
-    """Load overview data from database"""
+    """Load overview data from database.
+
+    Returns a dict of scalars (no DataFrames) so st.cache_data never
+    hashes a frame when checking for mutation on rerun.
+    """
     try:
-        # Total customers
-        customers = db_manager.execute_query("SELECT COUNT(*) as count FROM customers")[0]['count']
-        
-        # Total orders
-        orders = db_manager.execute_query("SELECT COUNT(*) as count FROM orders")[0]['count']
-        
-        # Total revenue
-        revenue = db_manager.execute_query("SELECT COALESCE(SUM(total_amount), 0) as total FROM orders")[0]['total']
-        
+        # Share one pooled connection for both queries instead of paying
+        # checkout/return per query
+        with db_manager.connection() as cnx:
+            cursor = cnx.cursor(dictionary=True)
+            try:
+                # Fetch all scalar stats in a single round-trip instead of
+                # four separate queries
+                cursor.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM customers) as customers,
+                        (SELECT COUNT(*) FROM orders) as orders,
+                        (SELECT COALESCE(SUM(total_amount), 0) FROM orders) as revenue,
+                        (SELECT COUNT(*) FROM orders
+                         WHERE order_date_time >= DATE_SUB(NOW(), INTERVAL 7 DAY)) as recent_orders
+                """)
+                stats = cursor.fetchone()
+
+                # Repeat customers - count on the server instead of shipping
+                # one row per customer
+                cursor.execute("""
+                    SELECT COUNT(*) as count
+                    FROM (
+                        SELECT c.customer_id
+                        FROM customers c
+                        INNER JOIN orders o ON c.mobile_number = o.mobile_number
+                        GROUP BY c.customer_id
+                        HAVING COUNT(o.order_id) > 1
+                    ) t
+                """)
+                repeat_row = cursor.fetchone()
+            finally:
+                cursor.close()
+
+        customers = stats['customers']
+        orders = stats['orders']
+        revenue = stats['revenue']
+        recent_orders = stats['recent_orders']
+        repeat_count = repeat_row['count'] if repeat_row else 0
+
         # Average order value
         avg_order = revenue / orders if orders > 0 else 0
-        
-        # Recent orders (last 7 days)
-        recent_orders = db_manager.execute_query("""
-            SELECT COUNT(*) as count 
-            FROM orders 
-            WHERE order_date_time >= DATE_SUB(NOW(), INTERVAL 7 DAY)
-        """)[0]['count']
-        
-        # Repeat customers
-        repeat_customers = db_manager.execute_query("""
-            SELECT COUNT(DISTINCT c.customer_id) as count
-            FROM customers c
-            INNER JOIN orders o ON c.mobile_number = o.mobile_number
-            GROUP BY c.customer_id
-            HAVING COUNT(o.order_id) > 1
-        """)
-        repeat_count = len(repeat_customers)
-        
+
         return {
             'customers': customers,
             'orders': orders,
@@ -106,19 +128,37 @@ if data:
         st.metric("🔁 Repeat", f"{data['repeat_customers']:,}")
     
     st.markdown("---")
-    
+
+    # Kick off all four KPI queries concurrently so each section renders
+    # as soon as its own result resolves instead of waiting on the sum of
+    # four sequential round-trips
+    table_kpi_engine = get_table_engine()
+    executor = ThreadPoolExecutor(max_workers=4)
+    monthly_future = executor.submit(table_kpi_engine.calculate_kpi, 'monthly_trends')
+    regional_future = executor.submit(table_kpi_engine.calculate_kpi, 'regional_revenue')
+    top_customers_future = executor.submit(
+        table_kpi_engine.calculate_kpi, 'top_customers', days=30, limit=10
+    )
+    repeat_future = executor.submit(
+        table_kpi_engine.calculate_kpi, 'repeat_customers', limit=10
+    )
+    executor.shutdown(wait=False)
+
     # Charts section
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.markdown("### 📅 Monthly Order Trends")
-        
+
         # Get monthly data
-        monthly_result = table_kpi_engine.calculate_kpi('monthly_trends')
+        monthly_result = monthly_future.result()
         if monthly_result['success']:
             monthly_df = pd.DataFrame(monthly_result['data'])
             
             if not monthly_df.empty:
+                # Deferred import - only pay the plotly import cost when a chart renders
+                import plotly.graph_objects as go
+
                 fig = go.Figure()
                 
                 # Orders line
@@ -164,11 +204,13 @@ if data:
         st.markdown("### 🌍 Regional Revenue Distribution")
         
         # Get regional data
-        regional_result = table_kpi_engine.calculate_kpi('regional_revenue')
+        regional_result = regional_future.result()
         if regional_result['success']:
             regional_df = pd.DataFrame(regional_result['data'])
             
             if not regional_df.empty:
+                import plotly.express as px
+
                 fig = px.pie(
                     regional_df,
                     values='total_revenue',
@@ -199,21 +241,26 @@ if data:
     with col1:
         st.markdown("### 🏆 Top Customers (Last 30 Days)")
         
-        top_customers_result = table_kpi_engine.calculate_kpi('top_customers', days=30, limit=10)
+        top_customers_result = top_customers_future.result()
         if top_customers_result['success']:
             top_df = pd.DataFrame(top_customers_result['data'])
             
             if not top_df.empty:
-                # Format the dataframe
-                display_df = top_df[['customer_name', 'region', 'order_count', 'total_spend']].copy()
-                display_df['total_spend'] = display_df['total_spend'].apply(lambda x: f"₹{float(x):,.2f}")
-                display_df.columns = ['Customer', 'Region', 'Orders', 'Total Spend']
-                
+                # Keep numeric dtype and let the browser handle labels and
+                # currency formatting - no Python-side column mutation
+                display_df = top_df[['customer_name', 'region', 'order_count', 'total_spend']]
+
                 st.dataframe(
                     display_df,
                     use_container_width=True,
                     hide_index=True,
-                    height=400
+                    height=400,
+                    column_config={
+                        'customer_name': st.column_config.TextColumn('Customer'),
+                        'region': st.column_config.TextColumn('Region'),
+                        'order_count': st.column_config.NumberColumn('Orders'),
+                        'total_spend': st.column_config.NumberColumn('Total Spend', format="₹%.2f")
+                    }
                 )
             else:
                 st.info("No data available for the last 30 days")
@@ -223,21 +270,24 @@ if data:
     with col2:
         st.markdown("### 🔁 Repeat Customers")
         
-        repeat_result = table_kpi_engine.calculate_kpi('repeat_customers')
+        # Limit applied in SQL so only 10 rows cross the wire
+        repeat_result = repeat_future.result()
         if repeat_result['success']:
             repeat_df = pd.DataFrame(repeat_result['data'])
-            
+
             if not repeat_df.empty:
-                # Show top 10 repeat customers
-                display_df = repeat_df.head(10)[['customer_name', 'order_count', 'total_spent']].copy()
-                display_df['total_spent'] = display_df['total_spent'].apply(lambda x: f"₹{float(x):,.2f}")
-                display_df.columns = ['Customer', 'Orders', 'Total Spent']
-                
+                display_df = repeat_df[['customer_name', 'order_count', 'total_spent']]
+
                 st.dataframe(
                     display_df,
                     use_container_width=True,
                     hide_index=True,
-                    height=400
+                    height=400,
+                    column_config={
+                        'customer_name': st.column_config.TextColumn('Customer'),
+                        'order_count': st.column_config.NumberColumn('Orders'),
+                        'total_spent': st.column_config.NumberColumn('Total Spent', format="₹%.2f")
+                    }
                 )
             else:
                 st.info("No repeat customers found")
@@ -249,4 +299,4 @@ else:
 
 # Footer
 st.markdown("---")
-st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
\ No newline at end of file
+st.caption(f"Last updated: {_now_str()}")
\ No newline at end of file
@@ -3,23 +3,38 @@ KPI Analytics - Detailed KPI views
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 
 from config.config import Config
-from src.kpis.table_based_kpis import table_kpi_engine
-from src.kpis.memory_based_kpis import memory_kpi_engine
+from src.kpis.table_based_kpis import get_table_engine
+from src.kpis.memory_based_kpis import get_memory_engine
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Result keys that are bookkeeping, not displayable summary metrics
+METADATA_SKIP_KEYS = frozenset({'data', 'kpi_name', 'description', 'calculated_at', 'success', 'method'})
+
+# Sidebar label -> engine KPI key
+KPI_KEY_MAP = {
+    "Repeat Customers": "repeat_customers",
+    "Monthly Order Trends": "monthly_trends",
+    "Regional Revenue": "regional_revenue",
+    "Top Customers (Last 30 Days)": "top_customers"
+}
+
 st.set_page_config(
     page_title="KPI Analytics",
     page_icon="📈",
     layout="wide"
 )
 
+
+@st.cache_data(ttl=60)
+def _now_str():
+    """Minute-resolution timestamp, cached so reruns skip the strftime call"""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
 st.title("📈 KPI Analytics")
 st.markdown("Detailed analysis of key performance indicators")
 
@@ -63,6 +78,7 @@ with st.sidebar:
     
     if st.button("🔄 Refresh Data", use_container_width=True):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
 
 # Main content
@@ -71,18 +87,80 @@ st.markdown("---")
 # Determine which engine to use
 use_memory = "Pandas" in processing_method
 
+def _result_df(data) -> pd.DataFrame:
+    """Build a DataFrame from a KPI payload.
+
+    The memory engine returns split form (column names once plus row
+    lists); the SQL engine returns row dicts. Both shapes land here.
+    """
+    if isinstance(data, dict):
+        return pd.DataFrame(data.get('rows', []), columns=data.get('columns'))
+    return pd.DataFrame(data)
+
+@st.cache_data
+def _csv_bytes(kpi_key, calculated_at, data) -> bytes:
+    """Build the download payload once per KPI result, not per rerun.
+
+    Keyed on (kpi_key, calculated_at) so a fresh calculation produces a
+    new entry while widget interactions reuse the cached bytes.
+    """
+    return _result_df(data).to_csv(index=False).encode()
+
+@st.cache_resource
+def _warm_memory_engine():
+    """Load the in-memory DataFrames once and share them across reruns.
+
+    cache_resource keeps the engine (and its DataFrames) alive as a
+    singleton, so changing days/limit does not reload the dataset.
+    """
+    engine = get_memory_engine()
+    engine.load_data()
+    return engine
+
 @st.cache_data(ttl=Config.CACHE_TTL)
 def calculate_kpis(use_memory_engine, days_param, limit_param):
-    """Calculate KPIs based on selected method"""
+    """Calculate KPIs based on selected method.
+
+    Returns plain dicts/lists (never DataFrames) so st.cache_data does
+    not hash a frame on every rerun - DataFrames are built in the
+    display branches, outside the cache boundary.
+    """
     if use_memory_engine:
-        memory_kpi_engine.load_data()
-        return memory_kpi_engine.calculate_all_kpis(days=days_param, limit=limit_param)
+        engine = _warm_memory_engine()
+        return engine.calculate_all_kpis(days=days_param, limit=limit_param)
     else:
-        return table_kpi_engine.calculate_all_kpis(days=days_param, limit=limit_param)
+        return get_table_engine().calculate_all_kpis(days=days_param, limit=limit_param)
 
-# Calculate KPIs
-with st.spinner(f"Calculating KPIs using {processing_method}..."):
-    kpi_results = calculate_kpis(use_memory, days, limit)
+@st.cache_data(ttl=Config.CACHE_TTL)
+def calculate_single_kpi(use_memory_engine, kpi_key, days_param, limit_param):
+    """Calculate one KPI without recomputing the other three"""
+    if use_memory_engine:
+        engine = _warm_memory_engine()
+        if kpi_key == 'top_customers':
+            return engine.calculate_top_customers_last_30_days(
+                days=days_param, limit=limit_param
+            )
+        memory_methods = {
+            'repeat_customers': engine.calculate_repeat_customers,
+            'monthly_trends': engine.calculate_monthly_trends,
+            'regional_revenue': engine.calculate_regional_revenue
+        }
+        return memory_methods[kpi_key]()
+    else:
+        # days/limit only parameterize top_customers (mirroring
+        # calculate_all_kpis): forwarding limit to repeat_customers
+        # would cap its rows server-side and compute the summary
+        # metadata over the truncated set
+        if kpi_key == 'top_customers':
+            return get_table_engine().calculate_kpi(
+                kpi_key, days=days_param, limit=limit_param
+            )
+        return get_table_engine().calculate_kpi(kpi_key)
+
+# Calculate all KPIs only when the combined view is selected
+if selected_kpi == "All KPIs":
+    with st.spinner(f"Calculating KPIs using {processing_method}..."):
+        kpi_results = calculate_kpis(use_memory, days, limit)
 
 # Display KPIs based on selection
 if selected_kpi == "All KPIs":
@@ -104,8 +182,8 @@ if selected_kpi == "All KPIs":
         with col3:
             st.metric("Total Revenue", f"₹{metadata.get('total_revenue', 0):,.2f}")
         
-        if data:
-            df = pd.DataFrame(data)
+        df = _result_df(data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.error(f"Error: {result.get('error')}")
@@ -128,9 +206,11 @@ if selected_kpi == "All KPIs":
         with col3:
             st.metric("Avg Monthly Orders", f"{metadata.get('avg_monthly_orders', 0):.1f}")
         
-        if data:
-            df = pd.DataFrame(data)
-            
+        df = _result_df(data)
+        if not df.empty:
+            # Deferred import - only pay the plotly import cost when a chart renders
+            import plotly.express as px
+
             # Line chart
             fig = px.line(
                 df,
@@ -164,9 +244,10 @@ if selected_kpi == "All KPIs":
         with col3:
             st.metric("Top Region", metadata.get('highest_revenue_region', 'N/A'))
         
-        if data:
-            df = pd.DataFrame(data)
-            
+        df = _result_df(data)
+        if not df.empty:
+            import plotly.express as px
+
             col1, col2 = st.columns(2)
             
             with col1:
@@ -215,9 +296,10 @@ if selected_kpi == "All KPIs":
         with col3:
             st.metric("Avg Spend", f"₹{metadata.get('avg_spend_top_customers', 0):,.2f}")
         
-        if data:
-            df = pd.DataFrame(data)
-            
+        df = _result_df(data)
+        if not df.empty:
+            import plotly.express as px
+
             # Bar chart
             if 'customer_name' in df.columns and 'total_spend' in df.columns:
                 fig = px.bar(
@@ -240,39 +322,33 @@ else:
     # Display individual KPI
     st.markdown(f"## {selected_kpi}")
     
-    kpi_key_map = {
-        "Repeat Customers": "repeat_customers",
-        "Monthly Order Trends": "monthly_trends",
-        "Regional Revenue": "regional_revenue",
-        "Top Customers (Last 30 Days)": "top_customers"
-    }
-    
-    kpi_key = kpi_key_map.get(selected_kpi)
-    result = kpi_results.get(kpi_key, {})
+    kpi_key = KPI_KEY_MAP.get(selected_kpi)
+    with st.spinner(f"Calculating {selected_kpi} using {processing_method}..."):
+        result = calculate_single_kpi(use_memory, kpi_key, days, limit)
     
     if result.get('success'):
         data = result.get('data', [])
         metadata = result.get('metadata', result)
         
-        # Display metadata
+        # Display metadata - filter once, then zip into the columns
         st.markdown("### 📊 Summary")
-        cols = st.columns(len([k for k in metadata.keys() if k not in ['data', 'kpi_name', 'description', 'calculated_at', 'success', 'method']]))
-        for i, (key, value) in enumerate([item for item in metadata.items() if item[0] not in ['data', 'kpi_name', 'description', 'calculated_at', 'success', 'method']]):
-            with cols[i]:
+        items = [(k, v) for k, v in metadata.items() if k not in METADATA_SKIP_KEYS]
+        cols = st.columns(len(items)) if items else []
+        for col, (key, value) in zip(cols, items):
+            with col:
                 st.metric(key.replace('_', ' ').title(), f"{value:,.2f}" if isinstance(value, float) else value)
         
         st.markdown("---")
         
         # Display data
-        if data:
-            df = pd.DataFrame(data)
+        df = _result_df(data)
+        if not df.empty:
             st.dataframe(df, use_container_width=True, hide_index=True)
             
             # Download button
-            csv = df.to_csv(index=False)
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
+                data=_csv_bytes(kpi_key, result.get('calculated_at'), data),
                 file_name=f"{kpi_key}_{datetime.now().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
@@ -2,17 +2,19 @@
 Data Management - Upload and process data files
 """
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
-import io
+from concurrent.futures import ThreadPoolExecutor
+import shutil
 
 from config.config import Config
-from src.ingestion.csv_loader import csv_loader
-from src.ingestion.xml_loader import xml_loader
 from src.database.db_manager import db_manager
 from src.utils.logger import setup_logger
 
+# pandas and the ingestion loaders (which import pandas transitively)
+# are imported lazily inside the handlers that need them, so first
+# paint doesn't pay the ~300ms pandas import when the user only looks
+
 logger = setup_logger(__name__)
 
 st.set_page_config(
@@ -24,6 +26,97 @@ st.set_page_config(
 st.title("⚙️ Data Management")
 st.markdown("Upload and process customer and order data files")
 
+
+@st.cache_data(ttl=5)
+def _file_meta(path_str):
+    """Cached (exists, size, mtime) for a data file.
+
+    One stat per rerun instead of exists()+stat() per widget, and the
+    mtime doubles as the cache key for the row-count helpers. The save
+    buttons clear this so fresh uploads show up immediately.
+    """
+    path = Path(path_str)
+    if not path.exists():
+        return False, 0, 0.0
+    stat = path.stat()
+    return True, stat.st_size, stat.st_mtime
+
+
+@st.cache_data(ttl=60)
+def _count_csv_rows(path_str, mtime):
+    """Count CSV data rows without parsing the file through pandas.
+
+    mtime is part of the cache key so edits to the file invalidate
+    the cached count.
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return max(sum(1 for _ in f) - 1, 0)  # minus header
+
+
+@st.cache_data(ttl=30)
+def _customer_stats():
+    """Customer aggregate stats, cached so widget toggles skip the scan.
+
+    The headline count uses the information_schema estimate (O(1)); only
+    the distinct/min/max aggregates still scan the table.
+    """
+    stats = db_manager.execute_query("""
+        SELECT
+            COUNT(DISTINCT region) as total_regions,
+            MIN(created_at) as first_created,
+            MAX(created_at) as last_created
+        FROM customers
+    """)[0]
+    stats['total_customers'] = db_manager.approx_row_count('customers')
+    return stats
+
+
+@st.cache_data(ttl=30)
+def _order_stats():
+    """Order aggregate stats, cached so widget toggles skip the scan.
+
+    The headline count uses the information_schema estimate (O(1)); only
+    the revenue and distinct-SKU aggregates still scan the table.
+    """
+    stats = db_manager.execute_query("""
+        SELECT
+            SUM(total_amount) as total_revenue,
+            AVG(total_amount) as avg_order_value,
+            MIN(order_date_time) as earliest_order,
+            MAX(order_date_time) as latest_order,
+            COUNT(DISTINCT sku_id) as unique_skus
+        FROM orders
+    """)[0]
+    stats['total_orders'] = db_manager.approx_row_count('orders')
+    return stats
+
+
+@st.cache_data(ttl=30)
+def _recent_customers():
+    return db_manager.execute_query(
+        "SELECT customer_id, customer_name, region, created_at FROM customers ORDER BY created_at DESC LIMIT 5"
+    )
+
+
+@st.cache_data(ttl=30)
+def _recent_orders():
+    return db_manager.execute_query(
+        "SELECT order_id, mobile_number, total_amount, order_date_time FROM orders ORDER BY order_date_time DESC LIMIT 5"
+    )
+
+
+@st.cache_data(ttl=60)
+def _count_xml_orders(path_str, mtime):
+    """Count <order> elements with a streaming parse (O(1) memory)"""
+    import xml.etree.ElementTree as ET
+
+    count = 0
+    for _, elem in ET.iterparse(path_str, events=('end',)):
+        if elem.tag == 'order':
+            count += 1
+        elem.clear()
+    return count
+
 # Tabs for different operations
 tab1, tab2, tab3, tab4 = st.tabs(["📤 Upload Files", "🔄 Process Data", "📊 Data Status", "🗑️ Clear Data"])
 
@@ -46,18 +139,31 @@ with tab1:
         
         if csv_file is not None:
             try:
-                # Preview the file
-                df = pd.read_csv(csv_file)
-                st.success(f"✅ File loaded: {len(df)} rows")
-                
+                import pandas as pd
+
+                # Preview only the first 10 rows - no need to parse the
+                # whole file just to render a preview. Arrow-backed dtypes
+                # skip the pandas->Arrow reserialization st.dataframe does
+                # for browser transport.
+                csv_file.seek(0)
+                try:
+                    preview_df = pd.read_csv(csv_file, nrows=10, dtype_backend='pyarrow')
+                except (ImportError, TypeError, ValueError):
+                    csv_file.seek(0)
+                    preview_df = pd.read_csv(csv_file, nrows=10)
+                st.success(f"✅ File loaded: {csv_file.size / 1024:.1f} KB")
+
                 with st.expander("📋 Preview Data", expanded=True):
-                    st.dataframe(df.head(10), use_container_width=True)
-                
+                    st.dataframe(preview_df, use_container_width=True)
+
                 # Save button
                 if st.button("💾 Save Customer Data", key="save_csv", use_container_width=True):
-                    # Save to raw data directory
+                    # Stream the raw upload to disk without a pandas round-trip
                     save_path = Config.RAW_DATA_DIR / "customers.csv"
-                    df.to_csv(save_path, index=False)
+                    csv_file.seek(0)
+                    with open(save_path, 'wb') as f:
+                        shutil.copyfileobj(csv_file, f, length=1 << 20)
+                    _file_meta.clear()
                     st.success(f"✅ File saved to {save_path}")
                     logger.info(f"Customer CSV uploaded: {save_path}")
                     
@@ -77,19 +183,21 @@ with tab1:
         
         if xml_file is not None:
             try:
-                # Preview the file
-                content = xml_file.read().decode('utf-8')
-                st.success(f"✅ File loaded: {len(content)} characters")
-                
+                # Keep the upload as bytes; decode only the preview slice
+                # instead of holding the file as both bytes and str
+                raw = xml_file.getvalue()
+                st.success(f"✅ File loaded: {len(raw) / 1024:.1f} KB")
+
                 with st.expander("📋 Preview Data", expanded=True):
-                    st.code(content[:1000] + "..." if len(content) > 1000 else content, language="xml")
-                
+                    preview = raw[:1000].decode('utf-8', 'replace')
+                    st.code(preview + "..." if len(raw) > 1000 else preview, language="xml")
+
                 # Save button
                 if st.button("💾 Save Order Data", key="save_xml", use_container_width=True):
-                    # Save to raw data directory
+                    # Write the original bytes directly - no re-encode pass
                     save_path = Config.RAW_DATA_DIR / "orders.xml"
-                    with open(save_path, 'w', encoding='utf-8') as f:
-                        f.write(content)
+                    save_path.write_bytes(raw)
+                    _file_meta.clear()
                     st.success(f"✅ File saved to {save_path}")
                     logger.info(f"Order XML uploaded: {save_path}")
                     
@@ -110,14 +218,15 @@ with tab2:
     with col1:
         st.markdown("### 👥 Process Customer Data")
         
-        # Check if file exists
+        # Check if file exists (cached stat)
         csv_path = Config.RAW_DATA_DIR / "customers.csv"
-        if csv_path.exists():
+        csv_found, _, csv_mtime = _file_meta(str(csv_path))
+        if csv_found:
             st.success(f"✅ File found: {csv_path.name}")
-            
-            # Show file info
-            df = pd.read_csv(csv_path)
-            st.info(f"📊 Records in file: {len(df)}")
+
+            # Show file info (cached line count - no need to parse the CSV)
+            record_count = _count_csv_rows(str(csv_path), csv_mtime)
+            st.info(f"📊 Records in file: {record_count}")
             
             # Processing mode
             csv_mode = st.radio(
@@ -129,6 +238,8 @@ with tab2:
             
             # Process button
             if st.button("▶️ Process Customer Data", key="process_csv", use_container_width=True, type="primary"):
+                from src.ingestion.csv_loader import csv_loader
+
                 with st.spinner("Processing customer data..."):
                     result = csv_loader.process_csv(csv_path, mode=csv_mode)
                 
@@ -148,16 +259,14 @@ with tab2:
     with col2:
         st.markdown("### 📦 Process Order Data")
         
-        # Check if file exists
+        # Check if file exists (cached stat)
         xml_path = Config.RAW_DATA_DIR / "orders.xml"
-        if xml_path.exists():
+        xml_found, _, xml_mtime = _file_meta(str(xml_path))
+        if xml_found:
             st.success(f"✅ File found: {xml_path.name}")
-            
-            # Show file info
-            import xml.etree.ElementTree as ET
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            order_count = len(root.findall('order'))
+
+            # Show file info (cached streaming count - no full DOM load)
+            order_count = _count_xml_orders(str(xml_path), xml_mtime)
             st.info(f"📊 Records in file: {order_count}")
             
             # Processing mode
@@ -170,6 +279,8 @@ with tab2:
             
             # Process button
             if st.button("▶️ Process Order Data", key="process_xml", use_container_width=True, type="primary"):
+                from src.ingestion.xml_loader import xml_loader
+
                 with st.spinner("Processing order data..."):
                     result = xml_loader.process_xml(xml_path, mode=xml_mode)
                 
@@ -205,17 +316,28 @@ with tab2:
     
     with col2:
         if st.button("▶️ Process Both", use_container_width=True, type="primary"):
+            from src.ingestion.csv_loader import csv_loader
+            from src.ingestion.xml_loader import xml_loader
+
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            # Process CSV
-            status_text.text("Processing customers...")
-            csv_result = csv_loader.process_csv(mode=both_mode)
-            progress_bar.progress(50)
-            
-            # Process XML
-            status_text.text("Processing orders...")
-            xml_result = xml_loader.process_xml(mode=both_mode)
+            # Parse/validate/clean the order XML in a worker while the
+            # customer pipeline runs. The orders DB load itself must wait
+            # for customers: orders.mobile_number references
+            # customers(mobile_number) ON DELETE CASCADE, so a concurrent
+            # replace-mode customer load would reject or cascade-delete
+            # the order rows.
+            status_text.text("Processing customers (parsing orders in parallel)...")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                csv_future = executor.submit(csv_loader.process_csv, mode=both_mode)
+                orders_future = executor.submit(xml_loader.prepare)
+                csv_result = csv_future.result()
+                progress_bar.progress(50)
+
+                # Load orders (parent rows are now in place)
+                status_text.text("Loading orders...")
+                xml_result = xml_loader.process_xml(mode=both_mode, prepared=orders_future.result())
             progress_bar.progress(100)
             
             status_text.empty()
@@ -234,33 +356,20 @@ with tab2:
 
 # TAB 3: Data Status
 with tab3:
-    st.markdown("## 📊 Database Status")
-    
+    col1, col2 = st.columns([6, 1])
+    with col1:
+        st.markdown("## 📊 Database Status")
+    with col2:
+        if st.button("🔄 Refresh", key="refresh_status", use_container_width=True):
+            _customer_stats.clear()
+            _order_stats.clear()
+            _recent_customers.clear()
+            _recent_orders.clear()
+
     try:
-        # Customer stats
-        customer_query = """
-            SELECT 
-                COUNT(*) as total_customers,
-                COUNT(DISTINCT region) as total_regions,
-                MIN(created_at) as first_created,
-                MAX(created_at) as last_created
-            FROM customers
-        """
-        customer_stats = db_manager.execute_query(customer_query)[0]
-        
-        # Order stats
-        order_query = """
-            SELECT 
-                COUNT(*) as total_orders,
-                SUM(total_amount) as total_revenue,
-                AVG(total_amount) as avg_order_value,
-                MIN(order_date_time) as earliest_order,
-                MAX(order_date_time) as latest_order,
-                COUNT(DISTINCT sku_id) as unique_skus
-            FROM orders
-        """
-        order_stats = db_manager.execute_query(order_query)[0]
-        
+        customer_stats = _customer_stats()
+        order_stats = _order_stats()
+
         # Display stats
         col1, col2 = st.columns(2)
         
@@ -288,26 +397,22 @@ with tab3:
         
         # Recent activity
         st.markdown("### 🕐 Recent Activity")
-        
+
         col1, col2 = st.columns(2)
-        
+
         with col1:
             st.markdown("**Recent Customers**")
-            recent_customers = db_manager.execute_query(
-                "SELECT customer_id, customer_name, region, created_at FROM customers ORDER BY created_at DESC LIMIT 5"
-            )
+            recent_customers = _recent_customers()
             if recent_customers:
-                df = pd.DataFrame(recent_customers)
-                st.dataframe(df, use_container_width=True, hide_index=True)
-        
+                # st.dataframe takes the list of dicts directly - no need
+                # to import pandas on this always-rendered path
+                st.dataframe(recent_customers, use_container_width=True, hide_index=True)
+
         with col2:
             st.markdown("**Recent Orders**")
-            recent_orders = db_manager.execute_query(
-                "SELECT order_id, mobile_number, total_amount, order_date_time FROM orders ORDER BY order_date_time DESC LIMIT 5"
-            )
+            recent_orders = _recent_orders()
             if recent_orders:
-                df = pd.DataFrame(recent_orders)
-                st.dataframe(df, use_container_width=True, hide_index=True)
+                st.dataframe(recent_orders, use_container_width=True, hide_index=True)
         
     except Exception as e:
         st.error(f"Error loading database status: {e}")
@@ -326,9 +431,12 @@ with tab4:
             confirm = st.checkbox("I understand this will delete all customer data", key="confirm_customers")
             if confirm:
                 try:
-                    db_manager.execute_query("DELETE FROM customers", fetch=False)
-                    st.success("✅ Customer data cleared")
-                    logger.info("Customer data cleared from database")
+                    # TRUNCATE never fires ON DELETE CASCADE, so the
+                    # dependent orders must be cleared explicitly -
+                    # orders first, then customers, same as Clear All
+                    db_manager.truncate_tables(['orders', 'customers'])
+                    st.success("✅ Customer data cleared (dependent orders cleared too)")
+                    logger.info("Customer data and dependent orders cleared from database")
                 except Exception as e:
                     st.error(f"❌ Error: {e}")
                     logger.error(f"Error clearing customers: {e}")
@@ -339,7 +447,7 @@ with tab4:
             confirm = st.checkbox("I understand this will delete all order data", key="confirm_orders")
             if confirm:
                 try:
-                    db_manager.execute_query("DELETE FROM orders", fetch=False)
+                    db_manager.truncate_table('orders')
                     st.success("✅ Order data cleared")
                     logger.info("Order data cleared from database")
                 except Exception as e:
@@ -352,8 +460,8 @@ with tab4:
             confirm = st.checkbox("I understand this will delete ALL data", key="confirm_all")
             if confirm:
                 try:
-                    db_manager.execute_query("DELETE FROM orders", fetch=False)
-                    db_manager.execute_query("DELETE FROM customers", fetch=False)
+                    # Single connection, orders first to respect the FK
+                    db_manager.truncate_tables(['orders', 'customers'])
                     st.success("✅ All data cleared")
                     logger.info("All data cleared from database")
                 except Exception as e:
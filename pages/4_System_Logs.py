@@ -2,12 +2,69 @@
 System Logs - View application logs
 """
 import streamlit as st
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 import re
 
 from config.config import Config
 
+# Matches the level token in a log line; compiled once at import
+LEVEL_RE = re.compile(r'\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b')
+
+# Colorizer: one precompiled pattern plus an emoji dispatch table,
+# instead of five re.sub calls compiling their patterns per render
+COLORIZE_RE = re.compile(r'((DEBUG|INFO|WARNING|ERROR|CRITICAL).*)')
+LEVEL_EMOJI = {
+    'DEBUG': '🔵',
+    'INFO': '🟢',
+    'WARNING': '🟡',
+    'ERROR': '🔴',
+    'CRITICAL': '🟣'
+}
+
+
+def colorize_log(log_text):
+    """Prefix each level token with its emoji in a single pass"""
+    return COLORIZE_RE.sub(lambda m: f"{LEVEL_EMOJI[m.group(2)]} {m.group(1)}", log_text)
+
+
+# How much of the end of the log the display tabs read
+TAIL_MAX_BYTES = 262144
+
+
+def tail_lines(path, max_bytes=TAIL_MAX_BYTES):
+    """
+    Read only the last max_bytes of a log file
+
+    The display tabs show at most a few hundred recent lines, so there
+    is no need to slurp a multi-MB daily log into memory.
+    """
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        if size > max_bytes:
+            f.seek(size - max_bytes)
+            # Drop the first (likely partial) line of the window
+            return f.read().decode('utf-8', 'replace').splitlines(keepends=True)[1:]
+        return f.read().decode('utf-8', 'replace').splitlines(keepends=True)
+
+
+@st.cache_data(ttl=10)
+def _full_level_counts(path_str, mtime, size):
+    """Stream the whole file once for the Summary tab's level counts.
+
+    Keyed on (mtime, size) so new log writes invalidate the cache.
+    """
+    counts = Counter()
+    total = 0
+    with open(path_str, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            total += 1
+            match = LEVEL_RE.search(line)
+            if match:
+                counts[match.group(1)] += 1
+    return counts, total
+
 st.set_page_config(
     page_title="System Logs",
     page_icon="📋",
@@ -50,20 +107,27 @@ with st.sidebar:
 # Main content
 if log_file.exists():
     try:
-        # Read log file
-        with open(log_file, 'r', encoding='utf-8') as f:
-            log_lines = f.readlines()
-        
-        st.info(f"📄 Total log entries: {len(log_lines)}")
-        
-        # Filter logs
-        filtered_logs = []
-        for line in log_lines:
-            # Filter by log level
-            if any(level in line for level in log_levels):
-                # Filter by search term
-                if not search_term or search_term.lower() in line.lower():
-                    filtered_logs.append(line)
+        # Tail the log for the display tabs; the full file is only
+        # streamed (and cached) for the Summary counts
+        log_lines = tail_lines(log_file)
+        stat = log_file.stat()
+        level_counts, total_lines = _full_level_counts(str(log_file), stat.st_mtime, stat.st_size)
+
+        st.info(f"📄 Total log entries: {total_lines}")
+
+        # Filter the tailed window. Both predicates are compiled once per
+        # rerun so the loop body stays inside the C regex engine - no
+        # per-line generator frames or .lower() copies.
+        level_re = re.compile('|'.join(map(re.escape, log_levels))) if log_levels else None
+        search_re = re.compile(re.escape(search_term), re.IGNORECASE) if search_term else None
+
+        if level_re is None:
+            filtered_logs = []
+        else:
+            filtered_logs = [
+                line for line in log_lines
+                if level_re.search(line) and (search_re is None or search_re.search(line))
+            ]
         
         st.success(f"✅ Showing {len(filtered_logs)} entries after filtering")
         
@@ -84,21 +148,7 @@ if log_file.exists():
             display_logs = filtered_logs[-max_lines:] if not reverse_order else filtered_logs[-max_lines:][::-1]
             
             log_text = "".join(display_logs)
-            
-            # Color code by log level
-            def colorize_log(log_text):
-                # ERROR - red
-                log_text = re.sub(r'(ERROR.*)', r'🔴 \1', log_text)
-                # WARNING - yellow
-                log_text = re.sub(r'(WARNING.*)', r'🟡 \1', log_text)
-                # INFO - green
-                log_text = re.sub(r'(INFO.*)', r'🟢 \1', log_text)
-                # DEBUG - blue
-                log_text = re.sub(r'(DEBUG.*)', r'🔵 \1', log_text)
-                # CRITICAL - purple
-                log_text = re.sub(r'(CRITICAL.*)', r'🟣 \1', log_text)
-                return log_text
-            
+
             colored_logs = colorize_log(log_text)
             st.text_area("Logs", colored_logs, height=600, label_visibility="collapsed")
             
@@ -113,15 +163,7 @@ if log_file.exists():
         with tab2:
             st.markdown("### 📊 Log Summary")
             
-            # Count by log level
-            level_counts = {
-                "DEBUG": sum(1 for line in log_lines if "DEBUG" in line),
-                "INFO": sum(1 for line in log_lines if "INFO" in line),
-                "WARNING": sum(1 for line in log_lines if "WARNING" in line),
-                "ERROR": sum(1 for line in log_lines if "ERROR" in line),
-                "CRITICAL": sum(1 for line in log_lines if "CRITICAL" in line)
-            }
-            
+            # Level counts come from the single tally pass above
             col1, col2, col3, col4, col5 = st.columns(5)
             
             with col1:
@@ -1,11 +1,13 @@
 """
 Database connection and session management
 """
+import threading
+import time
+import weakref
+
 import mysql.connector
 from mysql.connector import pooling, Error
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import QueuePool
+from mysql.connector.errors import PoolError
 from contextlib import contextmanager
 from typing import Optional
 
@@ -14,14 +16,33 @@ from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Rows per batch for bulk operations - keeps statements under
+# max_allowed_packet while staying large enough to amortize round-trips
+BATCH_SIZE = 10_000
+
+# Seconds that test_connection/get_table_info results stay fresh -
+# several pages call them per rerun and the answers rarely change
+STATUS_CACHE_TTL = 5
+
+# Seconds between background pings of idle pooled connections. Must be
+# well under MySQL's wait_timeout so checkouts never pay a reconnect
+KEEPALIVE_INTERVAL = 60
+
 
 class DatabaseManager:
     """Manages database connections and operations"""
     
     _instance = None
     _connection_pool = None
-    _engine = None
-    _session_factory = None
+    # TTL cache for cheap status lookups: key -> (timestamp, value)
+    _status_cache = {}
+    # Prepared-statement cursors per underlying pooled connection:
+    # raw connection -> {sql: cursor}. get_connection hands out a fresh
+    # PooledMySQLConnection wrapper on every checkout, so anything
+    # stored on the wrapper vanishes at close(); the raw connection is
+    # what actually survives in the pool. Weak keys let each cache die
+    # with its connection
+    _prepared_cursors = weakref.WeakKeyDictionary()
     
     def __new__(cls):
         """Singleton pattern to ensure single instance"""
@@ -29,69 +50,143 @@ class DatabaseManager:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
         return cls._instance
     
+    _keepalive_thread = None
+
     def __init__(self):
         """Initialize database manager"""
         if not self._connection_pool:
             self._initialize_connection_pool()
-        if not self._engine:
-            self._initialize_sqlalchemy_engine()
-    
+        if not self._keepalive_thread:
+            self._start_keepalive()
+
     def _initialize_connection_pool(self):
         """Initialize MySQL connection pool"""
+        pool_kwargs = dict(
+            pool_name="akasa_pool",
+            pool_size=Config.DB_CONFIG['pool_size'],
+            pool_reset_session=Config.DB_CONFIG['pool_reset_session'],
+            host=Config.DB_CONFIG['host'],
+            port=Config.DB_CONFIG['port'],
+            database=Config.DB_CONFIG['database'],
+            user=Config.DB_CONFIG['user'],
+            password=Config.DB_CONFIG['password'],
+            autocommit=False,
+            charset='utf8mb4',
+            collation='utf8mb4_unicode_ci',
+            allow_local_infile=Config.DB_CONFIG['allow_local_infile']
+        )
         try:
+            # Prefer the C extension - it parses result rows without
+            # per-field Python overhead, the dominant cost of large
+            # fetchall() calls
             self._connection_pool = pooling.MySQLConnectionPool(
-                pool_name="akasa_pool",
-                pool_size=Config.DB_CONFIG['pool_size'],
-                pool_reset_session=True,
-                host=Config.DB_CONFIG['host'],
-                port=Config.DB_CONFIG['port'],
-                database=Config.DB_CONFIG['database'],
-                user=Config.DB_CONFIG['user'],
-                password=Config.DB_CONFIG['password'],
-                autocommit=False,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
+                use_pure=False, **pool_kwargs
             )
-            logger.info("MySQL connection pool created successfully")
-        except Error as e:
-            logger.error(f"Error creating connection pool: {e}")
-            raise
+            logger.info("MySQL connection pool created successfully (C extension)")
+        except (ImportError, Error) as e:
+            if isinstance(e, Error) and not isinstance(e, mysql.connector.errors.NotSupportedError):
+                logger.error(f"Error creating connection pool: {e}")
+                raise
+            logger.warning(f"C extension unavailable ({e}), falling back to pure Python")
+            try:
+                self._connection_pool = pooling.MySQLConnectionPool(
+                    use_pure=True, **pool_kwargs
+                )
+                logger.info("MySQL connection pool created successfully (pure Python)")
+            except Error as e:
+                logger.error(f"Error creating connection pool: {e}")
+                raise
     
-    def _initialize_sqlalchemy_engine(self):
-        """Initialize SQLAlchemy engine for ORM operations"""
-        try:
-            self._engine = create_engine(
-                Config.get_database_url(),
-                poolclass=QueuePool,
-                pool_size=Config.DB_CONFIG['pool_size'],
-                max_overflow=Config.DB_CONFIG['max_overflow'],
-                pool_recycle=Config.DB_CONFIG['pool_recycle'],
-                pool_pre_ping=Config.DB_CONFIG['pool_pre_ping'],
-                echo=False  # Set to True for SQL query logging
-            )
-            self._session_factory = scoped_session(
-                sessionmaker(bind=self._engine, autoflush=False, autocommit=False)
-            )
-            logger.info("SQLAlchemy engine created successfully")
-        except Exception as e:
-            logger.error(f"Error creating SQLAlchemy engine: {e}")
-            raise
-    
-    def get_connection(self):
+    def _start_keepalive(self):
+        """Start the background thread that keeps idle connections warm
+
+        MySQL drops connections idle past wait_timeout; the first
+        checkout after a quiet spell then pays a full reconnect
+        handshake. Pinging each idle connection once per
+        KEEPALIVE_INTERVAL keeps the pool fresh for the price of a no-op
+        round-trip per connection per minute.
+        """
+        self.__class__._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop, name="akasa-db-keepalive", daemon=True
+        )
+        self._keepalive_thread.start()
+
+    def _keepalive_loop(self):
+        """Cycle idle connections through a ping, forever"""
+        while True:
+            time.sleep(KEEPALIVE_INTERVAL)
+            try:
+                # Check out / ping / return through the public pool API so
+                # we never touch a connection another thread holds. Only
+                # cycle as many as are idle right now
+                idle = self._connection_pool._cnx_queue.qsize()
+                for _ in range(idle):
+                    try:
+                        connection = self._connection_pool.get_connection()
+                    except PoolError:
+                        break
+                    try:
+                        connection.ping(reconnect=True, attempts=1)
+                    finally:
+                        connection.close()
+            except Exception as e:
+                logger.debug(f"Connection keepalive pass failed: {e}")
+
+    def get_connection(self, retry_num: int = 2, retry_interval: float = 0.1):
         """
         Get a connection from the pool
-        
+
+        Args:
+            retry_num: Number of retries when the pool is exhausted
+            retry_interval: Seconds to wait between retries
+
         Returns:
             MySQL connection object
         """
+        for attempt in range(retry_num + 1):
+            try:
+                connection = self._connection_pool.get_connection()
+                logger.debug("Database connection acquired from pool")
+                return connection
+            except PoolError as e:
+                # Pool exhausted - short backoff and retry before giving up
+                if attempt < retry_num:
+                    logger.debug(f"Connection pool exhausted, retrying in {retry_interval}s")
+                    time.sleep(retry_interval)
+                    continue
+                logger.error(f"Error getting connection from pool: {e}")
+                raise
+            except Error as e:
+                logger.error(f"Error getting connection from pool: {e}")
+                raise
+    
+    @contextmanager
+    def connection(self):
+        """
+        Context manager that shares one pooled connection across queries
+
+        Use this when issuing several queries back-to-back so they reuse
+        a single checkout instead of paying pool traffic per query.
+
+        Yields:
+            MySQL connection object
+        """
+        connection = None
         try:
-            connection = self._connection_pool.get_connection()
-            logger.debug("Database connection acquired from pool")
-            return connection
+            connection = self.get_connection()
+            yield connection
+            connection.commit()
         except Error as e:
-            logger.error(f"Error getting connection from pool: {e}")
+            if connection:
+                connection.rollback()
+                logger.warning("Database transaction rolled back")
+            logger.error(f"Database error: {e}")
             raise
-    
+        finally:
+            if connection:
+                connection.close()
+                logger.debug("Database connection returned to pool")
+
     @contextmanager
     def get_cursor(self, dictionary=True):
         """
@@ -125,26 +220,53 @@ class DatabaseManager:
                 logger.debug("Database connection returned to pool")
     
     @contextmanager
-    def get_session(self):
+    def get_bulk_cursor(self, dictionary=False):
         """
-        Context manager for SQLAlchemy session
-        
+        Context manager for a cursor tuned for bulk ingestion
+
+        Disables unique and foreign-key checks for the duration and
+        commits once at exit, so a multi-batch load pays one fsync
+        instead of one per batch plus per-row check overhead. Callers
+        must load parent rows before children - FK enforcement is off
+        inside the block.
+
         Yields:
-            SQLAlchemy session
+            Database cursor
         """
-        session = self._session_factory()
+        connection = None
+        cursor = None
         try:
-            yield session
-            session.commit()
-            logger.debug("SQLAlchemy session committed")
+            connection = self.get_connection()
+            cursor = connection.cursor(dictionary=dictionary)
+            cursor.execute("SET unique_checks=0")
+            cursor.execute("SET foreign_key_checks=0")
+            yield cursor
+            connection.commit()
+            self._invalidate_status_cache()
+            logger.debug("Bulk transaction committed")
         except Exception as e:
-            session.rollback()
-            logger.error(f"SQLAlchemy session error: {e}")
+            # Roll back on any failure, not just MySQL errors - a caller
+            # aborting mid-stream must not leave an open transaction on a
+            # connection that is about to rejoin the pool
+            if connection:
+                connection.rollback()
+                logger.warning("Bulk transaction rolled back")
+            logger.error(f"Database error: {e}")
             raise
         finally:
-            session.close()
-            logger.debug("SQLAlchemy session closed")
-    
+            if cursor:
+                # SET statements are not transactional - always restore
+                # the checks before the connection goes back to the pool
+                try:
+                    cursor.execute("SET unique_checks=1")
+                    cursor.execute("SET foreign_key_checks=1")
+                except Error:
+                    pass
+                cursor.close()
+            if connection:
+                connection.close()
+                logger.debug("Database connection returned to pool")
+
     def execute_query(self, query: str, params: tuple = None, fetch: bool = True):
         """
         Execute a SQL query
@@ -162,36 +284,346 @@ class DatabaseManager:
             if fetch:
                 return cursor.fetchall()
             return None
-    
-    def execute_many(self, query: str, data: list):
+
+    def execute_scalar(self, query: str, params: tuple = None):
+        """
+        Execute a query and return the first column of the first row
+
+        For single-value lookups like COUNT(*) this skips the dict the
+        dictionary cursor would build per row just to unwrap one field.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+
+        Returns:
+            The scalar value, or None if the query returned no rows
+        """
+        with self.get_cursor(dictionary=False) as cursor:
+            cursor.execute(query, params or ())
+            rows = cursor.fetchall()
+            return rows[0][0] if rows else None
+
+    def fetch_dataframe(self, query: str, params: tuple = None):
+        """
+        Execute a query and return the result set as a DataFrame
+
+        Fetches tuple rows (no dict per row from the connector) and
+        transposes them into columns once, so pandas builds one array
+        per column instead of re-discovering the schema row by row as
+        pd.DataFrame over a list of dicts does.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+
+        Returns:
+            DataFrame with the cursor's column names
+        """
+        # Imported lazily so dashboard pages that only need db_manager
+        # keep pandas off their import path
+        import pandas as pd
+
+        with self.get_cursor(dictionary=False) as cursor:
+            cursor.execute(query, params or ())
+            columns = [desc[0] for desc in cursor.description]
+            rows = cursor.fetchall()
+
+        if rows:
+            data = dict(zip(columns, zip(*rows)))
+        else:
+            data = {col: [] for col in columns}
+        return pd.DataFrame(data, columns=columns)
+
+    def execute_prepared(self, query: str, params: tuple = None):
+        """
+        Execute a query through a server-side prepared statement
+
+        Prepared cursors are cached on the pooled connection they ran
+        on, keyed by the SQL text, so a repeated query (dashboard
+        refreshes re-running the KPI queries) skips the server's
+        parse/plan step and goes straight to execution. Statements
+        survive checkouts because pool_reset_session is off by default;
+        if the server has deallocated one anyway, the failed execute
+        re-prepares once.
+
+        Args:
+            query: SQL query string
+            params: Query parameters
+
+        Returns:
+            Rows as dictionaries, matching execute_query
+        """
+        connection = None
+        try:
+            connection = self.get_connection()
+            # Cache on the raw connection beneath the pooled wrapper -
+            # the wrapper is rebuilt per checkout and would drop the
+            # cache (and leak an open prepared cursor) on every return
+            raw = getattr(connection, '_cnx', connection)
+            cache = self._prepared_cursors.get(raw)
+            if cache is None:
+                cache = {}
+                self._prepared_cursors[raw] = cache
+
+            cursor = cache.get(query)
+            if cursor is None:
+                cursor = connection.cursor(prepared=True)
+                cache[query] = cursor
+            try:
+                cursor.execute(query, params or ())
+            except Error:
+                cache.pop(query, None)
+                cursor = connection.cursor(prepared=True)
+                cursor.execute(query, params or ())
+                cache[query] = cursor
+
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            # Cached cursors stay open on the connection; only the
+            # connection itself returns to the pool
+            if connection:
+                connection.close()
+
+    def execute_many(self, query: str, data: list, batch_size: int = BATCH_SIZE,
+                     bulk: bool = False):
         """
         Execute a query multiple times with different data
-        
+
+        Data is paged in batch_size chunks so wide batches cannot exceed
+        max_allowed_packet; all chunks commit in one transaction.
+        mysql-connector rewrites each executemany over an INSERT ...
+        VALUES statement (including ON DUPLICATE KEY UPDATE) into one
+        multi-row INSERT, so every chunk is a single round-trip.
+
         Args:
             query: SQL query string
             data: List of tuples containing query parameters
+            batch_size: Rows per executemany call
+            bulk: Use get_bulk_cursor (checks off, single commit) - only
+                for ingestion paths that load parents before children
         """
-        with self.get_cursor() as cursor:
-            cursor.executemany(query, data)
+        cursor_ctx = self.get_bulk_cursor() if bulk else self.get_cursor()
+        with cursor_ctx as cursor:
+            for i in range(0, len(data), batch_size):
+                cursor.executemany(query, data[i:i + batch_size])
             logger.info(f"Executed batch query with {len(data)} records")
+        self._invalidate_status_cache()
+
+    def execute_bulk_insert(self, table: str, columns: list, rows: list,
+                            batch_size: int = BATCH_SIZE) -> int:
+        """
+        Insert rows using multi-row VALUES statements
+
+        Builds "INSERT INTO t (cols) VALUES (...), (...), ..." per chunk,
+        which MySQL executes far faster than per-row inserts.
+
+        Args:
+            table: Target table name
+            columns: Column names in row order
+            rows: List of tuples to insert
+            batch_size: Rows per INSERT statement
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        placeholder = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        prefix = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+
+        with self.get_cursor() as cursor:
+            for i in range(0, len(rows), batch_size):
+                chunk = rows[i:i + batch_size]
+                statement = prefix + ", ".join([placeholder] * len(chunk))
+                params = [value for row in chunk for value in row]
+                cursor.execute(statement, params)
+            logger.info(f"Bulk inserted {len(rows)} rows into {table}")
+
+        self._invalidate_status_cache()
+        return len(rows)
     
+    # Tables the app is allowed to truncate or bulk-load - guards against
+    # injection since table names cannot be parameterized
+    _MANAGED_TABLES = frozenset({'customers', 'orders'})
+
+    def load_infile(self, table: str, file_path, columns: list,
+                    replace: bool = True, ignore_lines: int = 1) -> int:
+        """
+        Bulk-load a CSV file with LOAD DATA LOCAL INFILE
+
+        The server parses the file directly, bypassing Python row
+        marshalling and per-row round-trips entirely.
+
+        Args:
+            table: Target table name (must be in the allowlist)
+            file_path: Path to the CSV file on this host
+            columns: Column names in file order
+            replace: REPLACE duplicate keys if True, IGNORE otherwise
+            ignore_lines: Header lines to skip
+
+        Returns:
+            Number of rows loaded
+        """
+        if table not in self._MANAGED_TABLES:
+            raise ValueError(f"Refusing to bulk-load unknown table: {table}")
+
+        path_str = str(file_path).replace('\\', '\\\\').replace("'", "\\'")
+        duplicate_mode = 'REPLACE' if replace else 'IGNORE'
+        query = (
+            f"LOAD DATA LOCAL INFILE '{path_str}' {duplicate_mode} INTO TABLE {table} "
+            "FIELDS TERMINATED BY ',' ENCLOSED BY '\"' "
+            "LINES TERMINATED BY '\\n' "
+            f"IGNORE {ignore_lines} LINES ({', '.join(columns)})"
+        )
+
+        with self.get_cursor() as cursor:
+            cursor.execute(query)
+            loaded = cursor.rowcount
+            logger.info(f"LOAD DATA loaded {loaded} rows into {table}")
+
+        self._invalidate_status_cache()
+        return loaded
+
+    def truncate_table(self, table_name: str):
+        """
+        Truncate a table (fast metadata operation vs row-by-row DELETE)
+
+        Args:
+            table_name: Name of the table (must be in the allowlist)
+        """
+        if table_name not in self._MANAGED_TABLES:
+            raise ValueError(f"Refusing to truncate unknown table: {table_name}")
+
+        with self.get_cursor() as cursor:
+            # orders references customers(mobile_number); TRUNCATE cannot
+            # run against a parent of an FK, so disable checks for the
+            # duration of the statement
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+            try:
+                cursor.execute(f"TRUNCATE TABLE {table_name}")
+            finally:
+                cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+            logger.info(f"Table {table_name} truncated")
+        self._invalidate_status_cache()
+
+    def truncate_tables(self, table_names: list):
+        """
+        Truncate several tables on one connection
+
+        Args:
+            table_names: Table names (each must be in the allowlist)
+        """
+        invalid = [t for t in table_names if t not in self._MANAGED_TABLES]
+        if invalid:
+            raise ValueError(f"Refusing to truncate unknown tables: {invalid}")
+
+        with self.get_cursor() as cursor:
+            cursor.execute("SET FOREIGN_KEY_CHECKS=0")
+            try:
+                for table_name in table_names:
+                    cursor.execute(f"TRUNCATE TABLE {table_name}")
+            finally:
+                cursor.execute("SET FOREIGN_KEY_CHECKS=1")
+            logger.info(f"Tables truncated: {', '.join(table_names)}")
+        self._invalidate_status_cache()
+
+    def _status_cache_get(self, key):
+        """Return a fresh cached status value, or None if stale/missing"""
+        entry = self._status_cache.get(key)
+        if entry and time.monotonic() - entry[0] < STATUS_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _invalidate_status_cache(self):
+        """Drop cached status results after writes change table contents"""
+        self._status_cache.clear()
+
     def test_connection(self) -> bool:
         """
         Test database connection
-        
+
+        The result is memoized for STATUS_CACHE_TTL seconds so repeated
+        health checks across pages don't each cost a round-trip.
+
         Returns:
             True if connection successful, False otherwise
         """
+        cached = self._status_cache_get('test_connection')
+        if cached is not None:
+            return cached
         try:
             with self.get_cursor() as cursor:
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
                 logger.info("Database connection test successful")
-                return result is not None
+                ok = result is not None
+                self._status_cache['test_connection'] = (time.monotonic(), ok)
+                return ok
         except Error as e:
             logger.error(f"Database connection test failed: {e}")
             return False
     
+    def approx_row_count(self, table_name: str) -> int:
+        """
+        Approximate row count from information_schema
+
+        InnoDB's TABLE_ROWS is an estimate but reads in O(1) from table
+        metadata, where COUNT(*) scans the whole index. Good enough for
+        dashboard headline metrics.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            Estimated row count
+        """
+        result = self.execute_query(
+            "SELECT TABLE_ROWS as cnt FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+            (Config.DB_CONFIG['database'], table_name)
+        )
+        if not result or result[0]['cnt'] is None:
+            return 0
+        return int(result[0]['cnt'])
+
+    def approx_row_counts(self, table_names: list) -> dict:
+        """
+        Approximate row counts for several tables in one query
+
+        Same metadata lookup as approx_row_count, but one round-trip
+        covers the whole list instead of one per table. Views carry no
+        TABLE_ROWS estimate, so those fall back to a real COUNT(*)
+        rather than reporting a misleading 0.
+
+        Args:
+            table_names: Names of the tables
+
+        Returns:
+            Dict mapping each requested table name to its estimated
+            row count (0 for missing tables)
+        """
+        placeholders = ', '.join(['%s'] * len(table_names))
+        result = self.execute_query(
+            "SELECT TABLE_NAME as name, TABLE_ROWS as cnt "
+            "FROM information_schema.TABLES "
+            f"WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ({placeholders})",
+            (Config.DB_CONFIG['database'], *table_names)
+        )
+        counts = dict.fromkeys(table_names, 0)
+        for row in result or []:
+            if row['cnt'] is None:
+                # TABLE_ROWS is NULL for views (customer_order_summary);
+                # the name comes back from information_schema, so it is
+                # a real object in our schema and safe to interpolate
+                counts[row['name']] = int(self.execute_scalar(
+                    f"SELECT COUNT(*) FROM `{row['name']}`") or 0)
+            else:
+                counts[row['name']] = int(row['cnt'])
+        return counts
+
     def get_table_info(self, table_name: str) -> dict:
         """
         Get information about a table
@@ -202,21 +634,26 @@ class DatabaseManager:
         Returns:
             Dictionary with table information
         """
+        cached = self._status_cache_get(('table_info', table_name))
+        if cached is not None:
+            return cached
         try:
             # Get column information
             query = f"DESCRIBE {table_name}"
             columns = self.execute_query(query)
-            
-            # Get row count
-            count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-            count_result = self.execute_query(count_query)
-            row_count = count_result[0]['count'] if count_result else 0
-            
-            return {
+
+            # Row count from information_schema metadata - approximate,
+            # but a short-TTL cached COUNT(*) would mislead just the same
+            # and this reads in O(1) instead of scanning the index
+            row_count = self.approx_row_count(table_name)
+
+            info = {
                 'table_name': table_name,
                 'columns': columns,
                 'row_count': row_count
             }
+            self._status_cache[('table_info', table_name)] = (time.monotonic(), info)
+            return info
         except Error as e:
             logger.error(f"Error getting table info for {table_name}: {e}")
             return {}
@@ -224,14 +661,28 @@ class DatabaseManager:
     def close(self):
         """Close all database connections"""
         try:
-            if self._session_factory:
-                self._session_factory.remove()
-            if self._engine:
-                self._engine.dispose()
+            if self._connection_pool:
+                # Drain idle connections; checked-out ones close on return
+                self._connection_pool._remove_connections()
             logger.info("Database connections closed")
         except Exception as e:
             logger.error(f"Error closing database connections: {e}")
 
 
-# Create singleton instance
-db_manager = DatabaseManager()
\ No newline at end of file
+# Create singleton instance. Under Streamlit the instance lives in
+# st.cache_resource so the pool survives the file-watcher's re-imports;
+# CLI scripts (test_*.py) fall back to plain construction.
+try:
+    import streamlit as st
+
+    @st.cache_resource
+    def get_db_manager() -> DatabaseManager:
+        """Return the process-wide DatabaseManager"""
+        return DatabaseManager()
+
+except ImportError:
+    def get_db_manager() -> DatabaseManager:
+        """Return the process-wide DatabaseManager"""
+        return DatabaseManager()
+
+db_manager = get_db_manager()
\ No newline at end of file
@@ -1,6 +1,11 @@
 """
 CSV file loader for customer data
 """
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Optional, List, Dict
@@ -9,52 +14,110 @@ from datetime import datetime
 from config.config import Config
 from src.utils.logger import setup_logger
 from src.utils.validators import DataValidator
-from src.database.db_manager import db_manager
+from src.database.db_manager import db_manager, BATCH_SIZE
 
 logger = setup_logger(__name__)
 
+# Rows below which validation runs in-process - forking workers and
+# pickling shards costs more than it saves on small files
+PARALLEL_VALIDATE_THRESHOLD = 100_000
+
 
 class CSVLoader:
     """Load and validate customer data from CSV files"""
-    
+
+    # Upsert shared by the whole-file and chunked load paths
+    INSERT_QUERY = """
+        INSERT INTO customers (customer_id, customer_name, mobile_number, region)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            customer_name = VALUES(customer_name),
+            region = VALUES(region),
+            updated_at = CURRENT_TIMESTAMP
+    """
+
     def __init__(self):
         self.validator = DataValidator()
         self.required_columns = ['customer_id', 'customer_name', 'mobile_number', 'region']
-    
-    def load_csv(self, file_path: Path) -> Optional[pd.DataFrame]:
+
+    def _arrow_strings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast the customer string columns to Arrow-backed dtype
+
+        Object columns hold a Python object per cell; Arrow strings sit
+        in contiguous buffers, cutting memory several-fold and letting
+        the downstream .str passes run in C. No-op when pyarrow is
+        missing or the columns are Arrow-backed already.
+
+        Args:
+            df: Freshly loaded DataFrame
+
+        Returns:
+            Frame with string columns cast (or the input unchanged)
+        """
+        try:
+            cols = [col for col in self.required_columns if col in df.columns]
+            return df.astype({col: 'string[pyarrow]' for col in cols})
+        except (ImportError, TypeError):
+            return df
+
+    def load_csv(self, file_path: Path, chunksize: Optional[int] = None):
         """
         Load CSV file into DataFrame
-        
+
         Args:
             file_path: Path to CSV file
-            
+            chunksize: If set, return a chunk iterator instead of a
+                DataFrame so the file is never held in memory whole
+
         Returns:
-            DataFrame or None if error
+            DataFrame (or chunk iterator) or None if error
         """
         try:
             logger.info(f"Loading CSV file: {file_path}")
-            
+
             if not file_path.exists():
                 logger.error(f"File not found: {file_path}")
                 return None
-            
+
             # Load with customer_id as string
-            df = pd.read_csv(file_path, dtype={'customer_id': str})
+            if chunksize:
+                # The pyarrow engine has no chunksize support - the
+                # streaming path stays on the C engine
+                reader = pd.read_csv(file_path, dtype={'customer_id': str}, chunksize=chunksize)
+                logger.info(f"Streaming CSV in chunks of {chunksize} rows")
+                return reader
+
+            try:
+                # PyArrow parses in parallel worker threads and stores
+                # strings in Arrow arrays instead of per-cell Python
+                # objects - faster parse, smaller frame
+                df = pd.read_csv(file_path, engine='pyarrow',
+                                 dtype_backend='pyarrow', dtype={'customer_id': 'string'})
+            except (ImportError, TypeError, ValueError):
+                df = self._arrow_strings(pd.read_csv(file_path, dtype={'customer_id': str}))
             logger.info(f"Loaded {len(df)} rows from CSV")
-            
+
             return df
-            
+
         except Exception as e:
             logger.error(f"Error loading CSV file: {e}")
             return None
     
-    def validate_dataframe(self, df: pd.DataFrame) -> tuple[bool, List[str]]:
+    def validate_dataframe(self, df: pd.DataFrame,
+                           mobile_norm: Optional[pd.Series] = None,
+                           max_errors: int = 100) -> tuple[bool, List[str]]:
         """
         Validate DataFrame structure and content
-        
+
         Args:
             df: DataFrame to validate
-            
+            mobile_norm: Pre-normalized mobile column, so the pipeline
+                pays the regex pass once for validation and cleaning
+            max_errors: Report at most this many row errors - a file
+                with millions of bad rows is rejected either way, so
+                formatting every message is wasted work
+
         Returns:
             Tuple of (is_valid, error_messages)
         """
@@ -71,124 +134,210 @@ class CSVLoader:
             errors.append("CSV file is empty")
             return False, errors
         
-        # Validate data types and values
-        for idx, row in df.iterrows():
-            row_errors = []
-            
-            # Validate customer_id (must be non-empty string, max 25 chars)
-            customer_id = str(row['customer_id']).strip()
-            if not customer_id or len(customer_id) > 25:
-                row_errors.append(f"Invalid customer_id: {customer_id} (must be 1-25 characters)")
-            
-            # Validate customer_name
-            if not self.validator.validate_string(row['customer_name'], min_length=2):
-                row_errors.append(f"Invalid customer_name: {row['customer_name']}")
-            
-            # Validate mobile_number - accept any format, just normalize
-            normalized_mobile = self.validator.normalize_mobile_number(row['mobile_number'])
-            if not normalized_mobile:
-                row_errors.append(f"Invalid mobile_number: {row['mobile_number']} (must be 8-15 digits)")
-            
-            # Validate region
-            if not self.validator.validate_string(row['region'], min_length=2):
-                row_errors.append(f"Invalid region: {row['region']}")
-            
-            if row_errors:
-                errors.append(f"Row {idx + 2}: {', '.join(row_errors)}")  # idx+2 because CSV has header
-        
+        # Shard big frames across cores - the string checks still walk
+        # cells under the hood, so they scale with processes. Shards keep
+        # their slice of the original index, so row numbers stay right
+        cpu_count = os.cpu_count() or 1
+        if len(df) >= PARALLEL_VALIDATE_THRESHOLD and cpu_count > 1:
+            # Shards recompute the mobile transform locally rather than
+            # shipping an extra Series to every worker
+            shards = np.array_split(df, cpu_count)
+            with ProcessPoolExecutor(max_workers=cpu_count) as executor:
+                for shard_errors in executor.map(self._validate_shard, shards):
+                    errors.extend(shard_errors)
+                    if len(errors) >= max_errors:
+                        del errors[max_errors:]
+                        break
+        else:
+            errors.extend(self._validate_shard(df, mobile_norm, max_errors=max_errors))
+
         is_valid = len(errors) == 0
         if is_valid:
             logger.info("CSV validation successful")
         else:
             logger.warning(f"CSV validation failed with {len(errors)} errors")
-        
+
         return is_valid, errors
 
-    def clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _validate_shard(self, df: pd.DataFrame,
+                        mobile_norm: Optional[pd.Series] = None,
+                        max_errors: int = 100) -> List[str]:
+        """
+        Column-mask validation for one frame (or shard of one)
+
+        Returns:
+            Error messages for the first max_errors failing rows
+        """
+        errors = []
+
+        # Validate whole columns with boolean masks - one vectorized pass
+        # per check instead of a Python loop building a Series per row
+        customer_id = df['customer_id'].astype(str).str.strip()
+        bad_id = (customer_id.str.len() == 0) | (customer_id.str.len() > 25)
+
+        # Mirrors validate_string(min_length=2): length of the stripped
+        # string representation must be 2-255
+        name = df['customer_name'].astype(str).str.strip()
+        bad_name = ~name.str.len().between(2, 255)
+
+        # Same transform clean_dataframe applies, so the two stages agree
+        if mobile_norm is None:
+            mobile_norm = self.validator.normalize_mobile_series(df['mobile_number'])
+        bad_mobile = mobile_norm.isna()
+
+        region = df['region'].astype(str).str.strip()
+        bad_region = ~region.str.len().between(2, 255)
+
+        # Report only the (hopefully few) failing rows, capped so a
+        # thoroughly bad file doesn't pay O(n) string formatting
+        bad_any = (bad_id | bad_name | bad_mobile | bad_region).to_numpy()
+        for pos in np.flatnonzero(bad_any)[:max_errors]:
+            row_errors = []
+            if bad_id.iat[pos]:
+                row_errors.append(f"Invalid customer_id: {customer_id.iat[pos]} (must be 1-25 characters)")
+            if bad_name.iat[pos]:
+                row_errors.append(f"Invalid customer_name: {df['customer_name'].iat[pos]}")
+            if bad_mobile.iat[pos]:
+                row_errors.append(f"Invalid mobile_number: {df['mobile_number'].iat[pos]} (must be 8-15 digits)")
+            if bad_region.iat[pos]:
+                row_errors.append(f"Invalid region: {df['region'].iat[pos]}")
+            # Index label +2 so chunked reads and shards still report
+            # file line numbers (the RangeIndex runs on across both)
+            errors.append(f"Row {df.index[pos] + 2}: {', '.join(row_errors)}")
+
+        return errors
+
+    def clean_dataframe(self, df: pd.DataFrame,
+                        mobile_norm: Optional[pd.Series] = None) -> pd.DataFrame:
         """
         Clean and normalize DataFrame
-        
+
         Args:
             df: DataFrame to clean
-            
+            mobile_norm: Pre-normalized mobile column from validation,
+                saving a second regex pass over the largest column
+
         Returns:
             Cleaned DataFrame
         """
         logger.info("Cleaning customer data...")
         
-        df_clean = df.copy()
-        
-        # Remove leading/trailing whitespaces
-        for col in df_clean.columns:
-            if df_clean[col].dtype == 'object':
-                df_clean[col] = df_clean[col].str.strip()
-        
+        # Strip whitespace from every string column in one assign. The
+        # new frame shares the untouched columns with df instead of
+        # duplicating the whole thing the way df.copy() did; the stripped
+        # columns are fresh Series anyway
+        str_cols = [col for col in df.columns if pd.api.types.is_string_dtype(df[col])]
+        df_clean = df.assign(**{col: df[col].str.strip() for col in str_cols})
+
         # Ensure customer_id is string and clean
         df_clean['customer_id'] = df_clean['customer_id'].astype(str).str.strip()
         
-        # Normalize mobile numbers
-        df_clean['mobile_number'] = df_clean['mobile_number'].apply(
-            self.validator.normalize_mobile_number
-        )
-        
-        # Remove duplicates based on customer_id
-        initial_count = len(df_clean)
-        df_clean = df_clean.drop_duplicates(subset=['customer_id'], keep='first')
-        duplicates_removed = initial_count - len(df_clean)
+        # Normalize mobile numbers (vectorized - no per-cell .apply);
+        # aligns by index when the pipeline hands in the validated Series
+        if mobile_norm is None:
+            mobile_norm = self.validator.normalize_mobile_series(df_clean['mobile_number'])
+        df_clean['mobile_number'] = mobile_norm
         
+        # Drop duplicate customer_ids and rows with invalid data in one
+        # indexing pass - duplicated() is a single hash-table scan and
+        # fusing in the notna reduction avoids the intermediate frame
+        # drop_duplicates + dropna would each materialize
+        dup_mask = df_clean['customer_id'].duplicated(keep='first')
+        keep = ~dup_mask & df_clean[self.required_columns].notna().all(axis=1)
+        duplicates_removed = int(dup_mask.sum())
+
         if duplicates_removed > 0:
             logger.warning(f"Removed {duplicates_removed} duplicate customer records")
-        
-        # Remove rows with invalid data
-        df_clean = df_clean.dropna(subset=self.required_columns)
+
+        df_clean = df_clean.loc[keep]
         
         logger.info(f"Cleaning complete. {len(df_clean)} valid records")
         
         return df_clean
     
+    @staticmethod
+    def _insert_rows(df: pd.DataFrame) -> list:
+        """Build insert parameter tuples from the column arrays.
+
+        zip over the arrays builds the tuples in C - iterrows() would
+        allocate a Series per row just to read four fields.
+        clean_dataframe has already cast customer_id to str, so no
+        per-row re-cast is needed here.
+        """
+        return list(zip(
+            df['customer_id'].to_numpy(),
+            df['customer_name'].to_numpy(),
+            df['mobile_number'].to_numpy(),
+            df['region'].to_numpy()
+        ))
+
+    def _load_via_infile(self, df: pd.DataFrame) -> bool:
+        """
+        Replace-mode bulk load via LOAD DATA LOCAL INFILE
+
+        Writes the cleaned frame to a temp CSV and lets the server parse
+        it directly - one round-trip with no Python row marshalling,
+        the fastest ingest path MySQL offers.
+
+        Args:
+            df: Cleaned DataFrame to load
+
+        Returns:
+            True if successful
+
+        Raises:
+            Exception: When the driver or server disallows local infile;
+                the caller falls back to batched inserts
+        """
+        tmp = tempfile.NamedTemporaryFile(
+            mode='w', suffix='.csv', delete=False, newline='', encoding='utf-8'
+        )
+        try:
+            df.to_csv(tmp, index=False, header=False, columns=self.required_columns)
+            tmp.close()
+
+            db_manager.execute_query("DELETE FROM customers", fetch=False)
+            logger.info("Existing customer data cleared")
+            loaded = db_manager.load_infile(
+                'customers', tmp.name, self.required_columns, ignore_lines=0
+            )
+            logger.info(f"Successfully loaded {loaded} customer records via LOAD DATA")
+            return True
+        finally:
+            tmp.close()
+            os.unlink(tmp.name)
+
     def load_to_database(self, df: pd.DataFrame, mode: str = 'replace') -> bool:
         """
         Load customer data into database
-        
+
         Args:
             df: DataFrame to load
             mode: 'replace' or 'append'
-            
+
         Returns:
             True if successful, False otherwise
         """
         try:
             logger.info(f"Loading {len(df)} customer records to database (mode: {mode})")
-            
+
             if mode == 'replace':
+                try:
+                    return self._load_via_infile(df)
+                except Exception as e:
+                    logger.warning(f"LOAD DATA path unavailable ({e}); using batched inserts")
+
                 # Clear existing data
                 delete_query = "DELETE FROM customers"
                 db_manager.execute_query(delete_query, fetch=False)
                 logger.info("Existing customer data cleared")
             
-            # Prepare insert query
-            insert_query = """
-                INSERT INTO customers (customer_id, customer_name, mobile_number, region)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    customer_name = VALUES(customer_name),
-                    region = VALUES(region),
-                    updated_at = CURRENT_TIMESTAMP
-            """
-            
-            # Prepare data for insertion (customer_id as string)
-            data = [
-                (
-                    str(row['customer_id']),
-                    row['customer_name'],
-                    row['mobile_number'],
-                    row['region']
-                )
-                for _, row in df.iterrows()
-            ]
-            
-            # Execute batch insert
-            db_manager.execute_many(insert_query, data)
+            data = self._insert_rows(df)
+
+            # Execute batch insert with integrity checks on: the
+            # append-mode upsert relies on unique_checks to spot
+            # existing mobile_numbers via ON DUPLICATE KEY UPDATE
+            db_manager.execute_many(self.INSERT_QUERY, data)
             
             logger.info(f"Successfully loaded {len(data)} customer records")
             return True
@@ -197,14 +346,18 @@ class CSVLoader:
             logger.error(f"Error loading data to database: {e}")
             return False
     
-    def process_csv(self, file_path: Optional[Path] = None, mode: str = 'replace') -> Dict:
+    def process_csv(self, file_path: Optional[Path] = None, mode: str = 'replace',
+                    chunksize: Optional[int] = None) -> Dict:
         """
         Complete CSV processing pipeline
-        
+
         Args:
             file_path: Path to CSV file (uses default if None)
             mode: Database load mode ('replace' or 'append')
-            
+            chunksize: Stream the file this many rows at a time instead
+                of loading it whole; memory stays bounded and the load
+                still commits or rolls back as one transaction
+
         Returns:
             Dictionary with processing results
         """
@@ -215,27 +368,33 @@ class CSVLoader:
             'errors': [],
             'duration': 0
         }
-        
+
         try:
             # Use default path if not provided
             if file_path is None:
                 file_path = Config.CUSTOMERS_CSV
-            
+
+            if chunksize:
+                return self._process_csv_chunked(file_path, mode, chunksize, result)
+
             # Load CSV
             df = self.load_csv(file_path)
             if df is None:
                 result['errors'].append("Failed to load CSV file")
                 return result
             
+            # Normalize mobiles once; validation and cleaning both use it
+            mobile_norm = self.validator.normalize_mobile_series(df['mobile_number'])
+
             # Validate
-            is_valid, validation_errors = self.validate_dataframe(df)
+            is_valid, validation_errors = self.validate_dataframe(df, mobile_norm=mobile_norm)
             if not is_valid:
                 result['errors'].extend(validation_errors)
                 logger.error(f"Validation failed: {len(validation_errors)} errors")
                 return result
-            
+
             # Clean
-            df_clean = self.clean_dataframe(df)
+            df_clean = self.clean_dataframe(df, mobile_norm=mobile_norm)
             
             # Load to database
             if self.load_to_database(df_clean, mode=mode):
@@ -251,7 +410,53 @@ class CSVLoader:
         
         finally:
             result['duration'] = (datetime.now() - start_time).total_seconds()
-        
+
+        return result
+
+    def _process_csv_chunked(self, file_path: Path, mode: str,
+                             chunksize: int, result: Dict) -> Dict:
+        """
+        Streaming variant of process_csv
+
+        Each chunk is validated, cleaned and inserted before the next is
+        parsed, so peak memory is one chunk. All inserts (and the
+        replace-mode DELETE) run in a single transaction with integrity
+        checks on (the upsert needs unique_checks); a validation
+        failure mid-stream raises, which rolls the whole load back -
+        same all-or-nothing behavior as the whole-file path.
+        """
+        reader = self.load_csv(file_path, chunksize=chunksize)
+        if reader is None:
+            result['errors'].append("Failed to load CSV file")
+            return result
+
+        total = 0
+        with db_manager.get_cursor(dictionary=False) as cursor:
+            if mode == 'replace':
+                cursor.execute("DELETE FROM customers")
+                logger.info("Existing customer data cleared")
+
+            for chunk in reader:
+                chunk = self._arrow_strings(chunk)
+                mobile_norm = self.validator.normalize_mobile_series(chunk['mobile_number'])
+                is_valid, validation_errors = self.validate_dataframe(chunk, mobile_norm=mobile_norm)
+                if not is_valid:
+                    result['errors'].extend(validation_errors)
+                    # Raising rolls back everything inserted so far
+                    raise ValueError(f"Validation failed: {len(validation_errors)} errors")
+
+                rows = self._insert_rows(self.clean_dataframe(chunk, mobile_norm=mobile_norm))
+                for i in range(0, len(rows), BATCH_SIZE):
+                    cursor.executemany(self.INSERT_QUERY, rows[i:i + BATCH_SIZE])
+                total += len(rows)
+
+        # get_cursor doesn't clear the status cache on commit the way
+        # the bulk cursor did; the tables just changed, so do it here
+        db_manager._invalidate_status_cache()
+
+        result['success'] = True
+        result['records_loaded'] = total
+        logger.info(f"CSV processing completed successfully: {total} records (chunked)")
         return result
 
 
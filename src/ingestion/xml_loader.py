@@ -2,29 +2,100 @@
 XML file loader for order data
 """
 import xml.etree.ElementTree as ET
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
+
+# lxml parses in libxml2 C and can filter iterparse events by tag;
+# fall back to the stdlib parser when it isn't installed
+try:
+    from lxml import etree as lxml_etree
+    PARSE_ERRORS = (ET.ParseError, lxml_etree.XMLSyntaxError)
+except ImportError:
+    lxml_etree = None
+    PARSE_ERRORS = (ET.ParseError,)
 from typing import Optional, List, Dict
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 from config.config import Config
 from src.utils.logger import setup_logger
-from src.utils.validators import DataValidator
-from src.database.db_manager import db_manager
+from src.utils.validators import DataValidator, DATETIME_FORMATS
+from src.database.db_manager import db_manager, BATCH_SIZE
 
 logger = setup_logger(__name__)
 
 
 class XMLLoader:
     """Load and validate order data from XML files"""
-    
+
+    # Upsert shared by the whole-file and streaming load paths
+    INSERT_QUERY = """
+        INSERT INTO orders
+        (order_id, mobile_number, order_date_time, sku_id, sku_count, total_amount)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            sku_count = VALUES(sku_count),
+            total_amount = VALUES(total_amount)
+    """
+
+    # Resolves the insert fields of a cleaned order dict in C
+    _GET_FIELDS = itemgetter(
+        'order_id', 'mobile_number', 'order_date_time',
+        'sku_id', 'sku_count', 'total_amount'
+    )
+
     def __init__(self):
         self.validator = DataValidator()
         self.required_fields = [
             'order_id', 'mobile_number', 'order_date_time',
             'sku_id', 'sku_count', 'total_amount'
         ]
-    
+        self._field_set = frozenset(self.required_fields)
+
+    def _extract_order(self, elem) -> Dict:
+        """
+        Pull the required fields out of an <order> element
+
+        One walk over the children instead of an elem.find per field -
+        each find is a linear scan, so six of them made extraction
+        O(fields^2) per order. Missing fields stay None.
+        """
+        order = dict.fromkeys(self.required_fields)
+        for child in elem:
+            if child.tag in self._field_set:
+                order[child.tag] = child.text
+        return order
+
+    def _iter_orders(self, file_path: Path):
+        """
+        Stream parse: yield one dict per <order>, clearing each element
+        after use so peak memory is one element rather than the whole
+        document tree ET.parse would build.
+
+        Args:
+            file_path: Path to XML file
+
+        Yields:
+            Order dictionaries
+        """
+        if lxml_etree is not None:
+            # libxml2 yields only <order> end events; also delete
+            # processed siblings so the root doesn't accumulate
+            # cleared stubs on multi-GB files
+            for _, elem in lxml_etree.iterparse(str(file_path), tag='order', events=('end',)):
+                yield self._extract_order(elem)
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        else:
+            for _, elem in ET.iterparse(str(file_path), events=('end',)):
+                if elem.tag != 'order':
+                    continue
+                yield self._extract_order(elem)
+                elem.clear()
+
     def load_xml(self, file_path: Path) -> Optional[List[Dict]]:
         """
         Load XML file and parse into list of dictionaries
@@ -42,84 +113,136 @@ class XMLLoader:
                 logger.error(f"File not found: {file_path}")
                 return None
             
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            orders = []
-            for order_elem in root.findall('order'):
-                order = {}
-                for field in self.required_fields:
-                    elem = order_elem.find(field)
-                    order[field] = elem.text if elem is not None else None
-                
-                orders.append(order)
-            
+            orders = list(self._iter_orders(file_path))
             logger.info(f"Loaded {len(orders)} orders from XML")
             return orders
             
-        except ET.ParseError as e:
+        except PARSE_ERRORS as e:
             logger.error(f"XML parsing error: {e}")
             return None
         except Exception as e:
             logger.error(f"Error loading XML file: {e}")
             return None
     
-    def validate_orders(self, orders: List[Dict]) -> tuple[bool, List[str]]:
+    @staticmethod
+    def _parse_datetime_column(values: pd.Series) -> pd.Series:
+        """
+        Vectorized DataValidator.validate_datetime for a column
+
+        Tries the shared DATETIME_FORMATS in order, filling in rows the
+        earlier formats could not parse; anything left is NaT.
+
+        Args:
+            values: Raw order_date_time column
+
+        Returns:
+            Parsed datetime column with NaT where invalid
+        """
+        stripped = values.astype(str).str.strip()
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        for fmt in DATETIME_FORMATS:
+            mask = parsed.isna()
+            if not mask.any():
+                break
+            parsed[mask] = pd.to_datetime(stripped[mask], format=fmt, errors='coerce')
+        return parsed
+
+    def _transform_orders(self, df: pd.DataFrame) -> Dict[str, pd.Series]:
+        """
+        One set of vectorized column transforms per frame
+
+        Computed once and shared between validation (as masks) and
+        cleaning (as output values), so the regex and strptime passes
+        over the big columns never run twice.
+
+        Args:
+            df: Raw order frame
+
+        Returns:
+            Dict of transformed columns; invalid cells are NA/NaT
+        """
+        return {
+            'order_id': df['order_id'].astype(str).str.strip(),
+            'mobile_number': DataValidator.normalize_mobile_series(df['mobile_number']),
+            'order_date_time': self._parse_datetime_column(df['order_date_time']),
+            'sku_id': df['sku_id'].astype(str).str.strip(),
+            'sku_count': pd.to_numeric(df['sku_count'], errors='coerce'),
+            'total_amount': pd.to_numeric(df['total_amount'], errors='coerce')
+        }
+
+    def validate_orders(self, orders: List[Dict], offset: int = 0,
+                        max_errors: int = 100) -> tuple[bool, List[str]]:
         """
         Validate order data
-        
+
         Args:
             orders: List of order dictionaries
-            
+            offset: Orders already seen before this batch, so streaming
+                loads report file-wide order numbers
+            max_errors: Report at most this many order errors
+
         Returns:
             Tuple of (is_valid, error_messages)
         """
-        errors = []
-        
         if not orders:
-            errors.append("No orders found in XML file")
-            return False, errors
-        
-        for idx, order in enumerate(orders):
-            row_errors = []
-            
-            # Check required fields
-            missing_fields = [f for f in self.required_fields if f not in order or not order[f]]
-            if missing_fields:
-                row_errors.append(f"Missing fields: {missing_fields}")
-                errors.append(f"Order {idx + 1}: {', '.join(row_errors)}")
+            return False, ["No orders found in XML file"]
+
+        df = pd.DataFrame(orders, columns=self.required_fields)
+        return self._validate_frame(df, self._transform_orders(df), offset=offset,
+                                    max_errors=max_errors)
+
+    def _validate_frame(self, df: pd.DataFrame, transformed: Dict[str, pd.Series],
+                        offset: int = 0, max_errors: int = 100) -> tuple[bool, List[str]]:
+        """
+        Column-mask validation over the shared transforms
+
+        The masks mirror the scalar validators' semantics exactly; each
+        check is a vectorized pass instead of a Python call per cell.
+        Error messages are capped at max_errors - a file with millions
+        of bad orders is rejected either way.
+        """
+        errors = []
+
+        # A field is missing when absent, None or empty
+        missing_mask = df.isna() | (df == '')
+        row_missing = missing_mask.any(axis=1)
+
+        order_id = transformed['order_id']
+        bad_id = (order_id.str.len() == 0) | (order_id.str.len() > 25)
+
+        bad_mobile = transformed['mobile_number'].isna()
+        bad_date = transformed['order_date_time'].isna()
+
+        sku_id = transformed['sku_id']
+        bad_sku = ~sku_id.str.len().between(1, 255)
+
+        # ~(x > 0) rather than (x <= 0) so unparseable values (NaN) fail
+        bad_count = ~(transformed['sku_count'] > 0)
+        bad_amount = ~(transformed['total_amount'] >= 0)
+
+        bad_any = (row_missing | bad_id | bad_mobile | bad_date
+                   | bad_sku | bad_count | bad_amount).to_numpy()
+        for pos in np.flatnonzero(bad_any)[:max_errors]:
+            if row_missing.iat[pos]:
+                missing_fields = [f for f in self.required_fields if missing_mask[f].iat[pos]]
+                errors.append(f"Order {offset + pos + 1}: Missing fields: {missing_fields}")
                 continue
-            
-            # Validate order_id (must be non-empty string, max 25 chars)
-            order_id = str(order['order_id']).strip()
-            if not order_id or len(order_id) > 25:
-                row_errors.append(f"Invalid order_id: {order_id} (must be 1-25 characters)")
-            
-            # Validate mobile_number - accept any format, just normalize
-            normalized_mobile = self.validator.normalize_mobile_number(order['mobile_number'])
-            if not normalized_mobile:
-                row_errors.append(f"Invalid mobile_number: {order['mobile_number']} (must be 8-15 digits)")
-            
-            # Validate order_date_time
-            parsed_date = self.validator.validate_datetime(order['order_date_time'])
-            if not parsed_date:
-                row_errors.append(f"Invalid order_date_time: {order['order_date_time']}")
-            
-            # Validate sku_id
-            if not self.validator.validate_string(order['sku_id'], min_length=1):
-                row_errors.append(f"Invalid sku_id: {order['sku_id']}")
-            
-            # Validate sku_count
-            if not self.validator.validate_positive_number(order['sku_count']):
-                row_errors.append(f"Invalid sku_count: {order['sku_count']}")
-            
-            # Validate total_amount
-            if not self.validator.validate_non_negative_number(order['total_amount']):
-                row_errors.append(f"Invalid total_amount: {order['total_amount']}")
-            
-            if row_errors:
-                errors.append(f"Order {idx + 1}: {', '.join(row_errors)}")
-        
+
+            row_errors = []
+            if bad_id.iat[pos]:
+                row_errors.append(f"Invalid order_id: {order_id.iat[pos]} (must be 1-25 characters)")
+            if bad_mobile.iat[pos]:
+                row_errors.append(f"Invalid mobile_number: {df['mobile_number'].iat[pos]} (must be 8-15 digits)")
+            if bad_date.iat[pos]:
+                row_errors.append(f"Invalid order_date_time: {df['order_date_time'].iat[pos]}")
+            if bad_sku.iat[pos]:
+                row_errors.append(f"Invalid sku_id: {df['sku_id'].iat[pos]}")
+            if bad_count.iat[pos]:
+                row_errors.append(f"Invalid sku_count: {df['sku_count'].iat[pos]}")
+            if bad_amount.iat[pos]:
+                row_errors.append(f"Invalid total_amount: {df['total_amount'].iat[pos]}")
+            errors.append(f"Order {offset + pos + 1}: {', '.join(row_errors)}")
+
         is_valid = len(errors) == 0
         if is_valid:
             logger.info("XML validation successful")
@@ -138,45 +261,50 @@ class XMLLoader:
         Returns:
             Cleaned list of orders
         """
+        df = pd.DataFrame(orders, columns=self.required_fields)
+        return self._clean_frame(self._transform_orders(df))
+
+    def _clean_frame(self, transformed: Dict[str, pd.Series]) -> List[Dict]:
+        """
+        Build cleaned order dicts from the shared transforms
+
+        Rows with any NA transform are skipped and duplicate order_ids
+        drop all but the first occurrence, matching the old per-order
+        loop. Values are rebuilt as plain Python types because
+        mysql-connector cannot convert numpy scalars.
+        """
         logger.info("Cleaning order data...")
-        
-        cleaned_orders = []
-        
-        for order in orders:
-            try:
-                cleaned_order = {
-                    'order_id': str(order['order_id']).strip(),  # Keep as string
-                    'mobile_number': self.validator.normalize_mobile_number(order['mobile_number']),
-                    'order_date_time': self.validator.validate_datetime(order['order_date_time']),
-                    'sku_id': order['sku_id'].strip(),
-                    'sku_count': int(order['sku_count']),
-                    'total_amount': float(order['total_amount'])
-                }
-                
-                # Only add if all fields are valid
-                if all(v is not None for v in cleaned_order.values()):
-                    cleaned_orders.append(cleaned_order)
-                else:
-                    logger.warning(f"Skipping order {order['order_id']} due to invalid data")
-                    
-            except Exception as e:
-                logger.warning(f"Error cleaning order {order.get('order_id', 'unknown')}: {e}")
-                continue
-        
-        # Remove duplicates based on order_id
-        initial_count = len(cleaned_orders)
-        seen_ids = set()
-        unique_orders = []
-        
-        for order in cleaned_orders:
-            if order['order_id'] not in seen_ids:
-                seen_ids.add(order['order_id'])
-                unique_orders.append(order)
-        
-        duplicates_removed = initial_count - len(unique_orders)
+
+        cleaned = pd.DataFrame(transformed)
+
+        valid = cleaned.notna().all(axis=1)
+        skipped = int((~valid).sum())
+        if skipped > 0:
+            logger.warning(f"Skipped {skipped} orders due to invalid data")
+
+        dup_mask = cleaned['order_id'].duplicated(keep='first') & valid
+        duplicates_removed = int(dup_mask.sum())
         if duplicates_removed > 0:
             logger.warning(f"Removed {duplicates_removed} duplicate order records")
-        
+
+        cleaned = cleaned.loc[valid & ~dup_mask]
+
+        unique_orders = [
+            {
+                'order_id': order_id,
+                'mobile_number': mobile,
+                'order_date_time': dt.to_pydatetime(),
+                'sku_id': sku_id,
+                'sku_count': int(sku_count),
+                'total_amount': float(total_amount)
+            }
+            for order_id, mobile, dt, sku_id, sku_count, total_amount in zip(
+                cleaned['order_id'], cleaned['mobile_number'],
+                cleaned['order_date_time'], cleaned['sku_id'],
+                cleaned['sku_count'], cleaned['total_amount']
+            )
+        ]
+
         logger.info(f"Cleaning complete. {len(unique_orders)} valid records")
         return unique_orders
     
@@ -200,31 +328,16 @@ class XMLLoader:
                 db_manager.execute_query(delete_query, fetch=False)
                 logger.info("Existing order data cleared")
             
-            # Prepare insert query
-            insert_query = """
-                INSERT INTO orders 
-                (order_id, mobile_number, order_date_time, sku_id, sku_count, total_amount)
-                VALUES (%s, %s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE
-                    sku_count = VALUES(sku_count),
-                    total_amount = VALUES(total_amount)
-            """
-            
-            # Prepare data for insertion (order_id as string)
-            data = [
-                (
-                    str(order['order_id']),  # Keep as string
-                    order['mobile_number'],
-                    order['order_date_time'],
-                    order['sku_id'],
-                    order['sku_count'],
-                    order['total_amount']
-                )
-                for order in orders
-            ]
-            
-            # Execute batch insert
-            db_manager.execute_many(insert_query, data)
+            # Prepare data for insertion. itemgetter resolves the six keys
+            # in C per order instead of six dict lookups in Python
+            # (clean_orders already stores order_id as a string)
+            data = [self._GET_FIELDS(order) for order in orders]
+
+            # Execute batch insert with integrity checks on: the upsert
+            # needs unique_checks to resolve re-sent order_ids, and
+            # foreign_key_checks rejects orders whose mobile_number has
+            # no customer instead of inserting silent orphans
+            db_manager.execute_many(self.INSERT_QUERY, data)
             
             logger.info(f"Successfully loaded {len(data)} order records")
             return True
@@ -233,14 +346,55 @@ class XMLLoader:
             logger.error(f"Error loading data to database: {e}")
             return False
     
-    def process_xml(self, file_path: Optional[Path] = None, mode: str = 'replace') -> Dict:
+    def prepare(self, file_path: Optional[Path] = None) -> tuple:
+        """
+        Parse, validate and clean an XML file without touching the database
+
+        Lets callers run the CPU-bound half of the pipeline concurrently
+        with other work and hand the result to process_xml afterwards.
+
+        Args:
+            file_path: Path to XML file (uses default if None)
+
+        Returns:
+            Tuple of (cleaned_orders, errors); cleaned_orders is None on failure
+        """
+        if file_path is None:
+            file_path = Config.ORDERS_XML
+
+        orders = self.load_xml(file_path)
+        if orders is None:
+            return None, ["Failed to load XML file"]
+        if not orders:
+            return None, ["No orders found in XML file"]
+
+        # One frame and one set of transforms feed both validation and
+        # cleaning, so the normalize/parse passes run once per column
+        df = pd.DataFrame(orders, columns=self.required_fields)
+        transformed = self._transform_orders(df)
+
+        is_valid, validation_errors = self._validate_frame(df, transformed)
+        if not is_valid:
+            logger.error(f"Validation failed: {len(validation_errors)} errors")
+            return None, validation_errors
+
+        return self._clean_frame(transformed), []
+
+    def process_xml(self, file_path: Optional[Path] = None, mode: str = 'replace',
+                    prepared: Optional[tuple] = None,
+                    chunksize: Optional[int] = None) -> Dict:
         """
         Complete XML processing pipeline
-        
+
         Args:
             file_path: Path to XML file (uses default if None)
             mode: Database load mode ('replace' or 'append')
-            
+            prepared: Optional (cleaned_orders, errors) from prepare() to
+                skip the parse/validate/clean phase
+            chunksize: Stream the file this many orders at a time with
+                parse/validate/clean/insert fused per batch; memory stays
+                bounded and the load still commits or rolls back whole
+
         Returns:
             Dictionary with processing results
         """
@@ -251,28 +405,23 @@ class XMLLoader:
             'errors': [],
             'duration': 0
         }
-        
+
         try:
-            # Use default path if not provided
             if file_path is None:
                 file_path = Config.ORDERS_XML
-            
-            # Load XML
-            orders = self.load_xml(file_path)
-            if orders is None:
-                result['errors'].append("Failed to load XML file")
-                return result
-            
-            # Validate
-            is_valid, validation_errors = self.validate_orders(orders)
-            if not is_valid:
-                result['errors'].extend(validation_errors)
-                logger.error(f"Validation failed: {len(validation_errors)} errors")
+
+            if prepared is None and chunksize:
+                return self._process_xml_chunked(file_path, mode, chunksize, result)
+
+            # Parse/validate/clean unless the caller already did
+            if prepared is None:
+                prepared = self.prepare(file_path)
+
+            cleaned_orders, prepare_errors = prepared
+            if cleaned_orders is None:
+                result['errors'].extend(prepare_errors)
                 return result
-            
-            # Clean
-            cleaned_orders = self.clean_orders(orders)
-            
+
             # Load to database
             if self.load_to_database(cleaned_orders, mode=mode):
                 result['success'] = True
@@ -287,7 +436,68 @@ class XMLLoader:
         
         finally:
             result['duration'] = (datetime.now() - start_time).total_seconds()
-        
+
+        return result
+
+    def _process_xml_chunked(self, file_path: Path, mode: str,
+                             chunksize: int, result: Dict) -> Dict:
+        """
+        Streaming variant of process_xml
+
+        Parse, validate, clean and insert run fused over batches of
+        chunksize orders, so no stage ever materializes the whole file.
+        All inserts (and the replace-mode DELETE) share one transaction
+        with integrity checks on, so orders referencing unknown mobiles
+        still fail loudly; an invalid batch raises, rolling the load
+        back - same all-or-nothing behavior as the whole-file path.
+        Duplicate order_ids are tracked across batches with a
+        persistent id set.
+        """
+        if not file_path.exists():
+            result['errors'].append("Failed to load XML file")
+            return result
+
+        total = 0
+        offset = 0
+        seen_ids = set()
+        orders_iter = self._iter_orders(file_path)
+
+        with db_manager.get_cursor(dictionary=False) as cursor:
+            if mode == 'replace':
+                cursor.execute("DELETE FROM orders")
+                logger.info("Existing order data cleared")
+
+            while batch := list(islice(orders_iter, chunksize)):
+                df = pd.DataFrame(batch, columns=self.required_fields)
+                transformed = self._transform_orders(df)
+
+                is_valid, validation_errors = self._validate_frame(df, transformed, offset=offset)
+                if not is_valid:
+                    result['errors'].extend(validation_errors)
+                    # Raising rolls back everything inserted so far
+                    raise ValueError(f"Validation failed: {len(validation_errors)} errors")
+
+                cleaned = [order for order in self._clean_frame(transformed)
+                           if order['order_id'] not in seen_ids]
+                seen_ids.update(order['order_id'] for order in cleaned)
+
+                rows = [self._GET_FIELDS(order) for order in cleaned]
+                for i in range(0, len(rows), BATCH_SIZE):
+                    cursor.executemany(self.INSERT_QUERY, rows[i:i + BATCH_SIZE])
+                total += len(rows)
+                offset += len(batch)
+
+            if offset == 0:
+                result['errors'].append("No orders found in XML file")
+                raise ValueError("Validation failed: 1 errors")
+
+        # get_cursor doesn't clear the status cache on commit the way
+        # the bulk cursor did; the tables just changed, so do it here
+        db_manager._invalidate_status_cache()
+
+        result['success'] = True
+        result['records_loaded'] = total
+        logger.info(f"XML processing completed successfully: {total} records (streamed)")
         return result
 
 
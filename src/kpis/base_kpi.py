@@ -45,20 +45,23 @@ class BaseKPI(ABC):
         Returns:
             Formatted result dictionary
         """
+        # One datetime.now() serves both the result dict and
+        # last_calculated - this runs once per KPI call
+        now = datetime.now()
         result = {
             'kpi_name': self.name,
             'description': self.description,
             'data': data,
-            'calculated_at': datetime.now().isoformat(),
+            'calculated_at': now.isoformat(),
             'success': True
         }
-        
+
         if metadata:
             result.update(metadata)
-        
-        self.last_calculated = datetime.now()
+
+        self.last_calculated = now
         self.last_result = result
-        
+
         return result
     
     def _format_error(self, error: Exception) -> Dict[str, Any]:
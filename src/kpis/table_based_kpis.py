@@ -1,9 +1,10 @@
 """
 Table-based KPI calculations using SQL queries
 """
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-import pandas as pd
 
 from src.kpis.base_kpi import BaseKPI
 from src.database.db_manager import db_manager
@@ -14,38 +15,50 @@ logger = setup_logger(__name__)
 
 class RepeatCustomersKPI(BaseKPI):
     """KPI 1: Customers with more than one order"""
-    
+
+    QUERY = """
+        SELECT
+            c.customer_id,
+            c.customer_name,
+            COUNT(o.order_id) as order_count,
+            SUM(o.total_amount) as total_spent
+        FROM customers c
+        INNER JOIN orders o ON c.mobile_number = o.mobile_number
+        GROUP BY c.customer_id, c.customer_name
+        HAVING COUNT(o.order_id) > 1
+        ORDER BY order_count DESC, total_spent DESC
+    """
+
     def __init__(self):
         super().__init__(
             name="Repeat Customers",
             description="Customers who have placed more than one order"
         )
     
-    def calculate(self, **kwargs) -> Dict[str, Any]:
-        """Calculate repeat customers using SQL"""
+    def calculate(self, limit: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Calculate repeat customers using SQL
+
+        Args:
+            limit: Optional cap on rows returned (applied server-side)
+        """
         try:
-            query = """
-                SELECT 
-                    c.customer_id,
-                    c.customer_name,
-                    COUNT(o.order_id) as order_count,
-                    SUM(o.total_amount) as total_spent
-                FROM customers c
-                INNER JOIN orders o ON c.mobile_number = o.mobile_number
-                GROUP BY c.customer_id, c.customer_name
-                HAVING COUNT(o.order_id) > 1
-                ORDER BY order_count DESC, total_spent DESC
-            """
-            
-            results = db_manager.execute_query(query)
-            
-            # Convert to DataFrame for better handling
-            df = pd.DataFrame(results)
-            
+            # Both SQL variants are stable strings, so each stays
+            # prepared server-side after its first run
+            query = self.QUERY
+            params = None
+            if limit is not None:
+                query += " LIMIT %s"
+                params = (limit,)
+
+            results = db_manager.execute_prepared(query, params)
+
+            # Metadata sums come straight off the row dicts - no
+            # DataFrame build just to call .sum() twice
             metadata = {
-                'total_repeat_customers': len(df),
-                'total_orders': int(df['order_count'].sum()) if not df.empty else 0,
-                'total_revenue': float(df['total_spent'].sum()) if not df.empty else 0.0
+                'total_repeat_customers': len(results),
+                'total_orders': int(sum(r['order_count'] for r in results)),
+                'total_revenue': float(sum(r['total_spent'] for r in results))
             }
             
             logger.info(f"Repeat Customers KPI: {metadata['total_repeat_customers']} customers found")
@@ -58,7 +71,19 @@ class RepeatCustomersKPI(BaseKPI):
 
 class MonthlyOrderTrendsKPI(BaseKPI):
     """KPI 2: Total orders and revenue aggregated by month"""
-    
+
+    QUERY = """
+        SELECT
+            DATE_FORMAT(order_date_time, '%Y-%m') as month_year,
+            COUNT(order_id) as total_orders,
+            SUM(total_amount) as total_revenue,
+            AVG(total_amount) as avg_order_value,
+            COUNT(DISTINCT mobile_number) as unique_customers
+        FROM orders
+        GROUP BY DATE_FORMAT(order_date_time, '%Y-%m')
+        ORDER BY month_year ASC
+    """
+
     def __init__(self):
         super().__init__(
             name="Monthly Order Trends",
@@ -68,27 +93,14 @@ class MonthlyOrderTrendsKPI(BaseKPI):
     def calculate(self, **kwargs) -> Dict[str, Any]:
         """Calculate monthly trends using SQL"""
         try:
-            query = """
-                SELECT 
-                    DATE_FORMAT(order_date_time, '%Y-%m') as month_year,
-                    COUNT(order_id) as total_orders,
-                    SUM(total_amount) as total_revenue,
-                    AVG(total_amount) as avg_order_value,
-                    COUNT(DISTINCT mobile_number) as unique_customers
-                FROM orders
-                GROUP BY DATE_FORMAT(order_date_time, '%Y-%m')
-                ORDER BY month_year ASC
-            """
-            
-            results = db_manager.execute_query(query)
-            
-            df = pd.DataFrame(results)
-            
+            results = db_manager.execute_prepared(self.QUERY)
+
+            total_orders = int(sum(r['total_orders'] for r in results))
             metadata = {
-                'total_months': len(df),
-                'total_orders': int(df['total_orders'].sum()) if not df.empty else 0,
-                'total_revenue': float(df['total_revenue'].sum()) if not df.empty else 0.0,
-                'avg_monthly_orders': float(df['total_orders'].mean()) if not df.empty else 0.0
+                'total_months': len(results),
+                'total_orders': total_orders,
+                'total_revenue': float(sum(r['total_revenue'] for r in results)),
+                'avg_monthly_orders': total_orders / len(results) if results else 0.0
             }
             
             logger.info(f"Monthly Trends KPI: {metadata['total_months']} months analyzed")
@@ -101,7 +113,20 @@ class MonthlyOrderTrendsKPI(BaseKPI):
 
 class RegionalRevenueKPI(BaseKPI):
     """KPI 3: Revenue aggregated by customer region"""
-    
+
+    QUERY = """
+        SELECT
+            c.region,
+            COUNT(DISTINCT c.customer_id) as customer_count,
+            COUNT(o.order_id) as total_orders,
+            SUM(o.total_amount) as total_revenue,
+            AVG(o.total_amount) as avg_order_value
+        FROM customers c
+        LEFT JOIN orders o ON c.mobile_number = o.mobile_number
+        GROUP BY c.region
+        ORDER BY total_revenue DESC
+    """
+
     def __init__(self):
         super().__init__(
             name="Regional Revenue",
@@ -111,26 +136,14 @@ class RegionalRevenueKPI(BaseKPI):
     def calculate(self, **kwargs) -> Dict[str, Any]:
         """Calculate regional revenue using SQL"""
         try:
-            query = """
-                SELECT 
-                    c.region,
-                    COUNT(DISTINCT c.customer_id) as customer_count,
-                    COUNT(o.order_id) as total_orders,
-                    SUM(o.total_amount) as total_revenue,
-                    AVG(o.total_amount) as avg_order_value
-                FROM customers c
-                LEFT JOIN orders o ON c.mobile_number = o.mobile_number
-                GROUP BY c.region
-                ORDER BY total_revenue DESC
-            """
-            
-            results = db_manager.execute_query(query)
-            
-            df = pd.DataFrame(results)
-            
+            results = db_manager.execute_prepared(self.QUERY)
+
+            # Regions without orders report NULL revenue from the LEFT
+            # JOIN; skip them like DataFrame.sum skipped NaN
             metadata = {
-                'total_regions': len(df),
-                'total_revenue': float(df['total_revenue'].sum()) if not df.empty else 0.0,
+                'total_regions': len(results),
+                'total_revenue': float(sum(r['total_revenue'] for r in results
+                                           if r['total_revenue'] is not None)),
                 'highest_revenue_region': results[0]['region'] if results else None
             }
             
@@ -144,7 +157,24 @@ class RegionalRevenueKPI(BaseKPI):
 
 class TopCustomersLast30DaysKPI(BaseKPI):
     """KPI 4: Top 10 customers by spend in last 30 days"""
-    
+
+    QUERY = """
+        SELECT
+            c.customer_id,
+            c.customer_name,
+            c.region,
+            COUNT(o.order_id) as order_count,
+            SUM(o.total_amount) as total_spend,
+            AVG(o.total_amount) as avg_order_value,
+            MAX(o.order_date_time) as last_order_date
+        FROM customers c
+        INNER JOIN orders o ON c.mobile_number = o.mobile_number
+        WHERE o.order_date_time >= DATE_SUB(NOW(), INTERVAL %s DAY)
+        GROUP BY c.customer_id, c.customer_name, c.region
+        ORDER BY total_spend DESC
+        LIMIT %s
+    """
+
     def __init__(self):
         super().__init__(
             name="Top Customers (Last 30 Days)",
@@ -160,32 +190,14 @@ class TopCustomersLast30DaysKPI(BaseKPI):
             limit: Number of top customers to return (default: 10)
         """
         try:
-            query = """
-                SELECT 
-                    c.customer_id,
-                    c.customer_name,
-                    c.region,
-                    COUNT(o.order_id) as order_count,
-                    SUM(o.total_amount) as total_spend,
-                    AVG(o.total_amount) as avg_order_value,
-                    MAX(o.order_date_time) as last_order_date
-                FROM customers c
-                INNER JOIN orders o ON c.mobile_number = o.mobile_number
-                WHERE o.order_date_time >= DATE_SUB(NOW(), INTERVAL %s DAY)
-                GROUP BY c.customer_id, c.customer_name, c.region
-                ORDER BY total_spend DESC
-                LIMIT %s
-            """
-            
-            results = db_manager.execute_query(query, (days, limit))
-            
-            df = pd.DataFrame(results)
-            
+            results = db_manager.execute_prepared(self.QUERY, (days, limit))
+
+            total_spend = float(sum(r['total_spend'] for r in results))
             metadata = {
                 'time_period_days': days,
-                'top_customer_count': len(df),
-                'total_revenue_top_customers': float(df['total_spend'].sum()) if not df.empty else 0.0,
-                'avg_spend_top_customers': float(df['total_spend'].mean()) if not df.empty else 0.0
+                'top_customer_count': len(results),
+                'total_revenue_top_customers': total_spend,
+                'avg_spend_top_customers': total_spend / len(results) if results else 0.0
             }
             
             logger.info(f"Top Customers KPI: {metadata['top_customer_count']} customers in last {days} days")
@@ -230,16 +242,28 @@ class TableBasedKPIEngine:
     def calculate_all_kpis(self, **kwargs) -> Dict[str, Any]:
         """
         Calculate all KPIs
-        
+
+        The four KPIs are independent queries, so they run concurrently on
+        separate pool connections and total wall time approaches the
+        slowest single query rather than the sum of all four.
+
         Returns:
             Dictionary with all KPI results
         """
         logger.info("Calculating all table-based KPIs...")
-        
-        results = {}
-        for kpi_name, kpi in self.kpis.items():
-            results[kpi_name] = kpi.calculate(**kwargs)
-        
+
+        with ThreadPoolExecutor(max_workers=len(self.kpis)) as executor:
+            futures = {}
+            for kpi_name, kpi in self.kpis.items():
+                # days/limit only parameterize top_customers; the other KPIs
+                # return their full result sets (mirrors the memory engine)
+                if kpi_name == 'top_customers':
+                    futures[kpi_name] = executor.submit(kpi.calculate, **kwargs)
+                else:
+                    futures[kpi_name] = executor.submit(kpi.calculate)
+
+            results = {kpi_name: future.result() for kpi_name, future in futures.items()}
+
         logger.info("All table-based KPIs calculated successfully")
         return results
     
@@ -255,5 +279,8 @@ class TableBasedKPIEngine:
         ]
 
 
-# Create singleton instance
-table_kpi_engine = TableBasedKPIEngine()
\ No newline at end of file
+# Singleton accessor: the engine (and its four KPI objects) is built on
+# first use, so import paths that never touch the KPIs skip it
+@cache
+def get_table_engine() -> TableBasedKPIEngine:
+    return TableBasedKPIEngine()
\ No newline at end of file
@@ -1,38 +1,30 @@
 """
 Logging configuration for the application
 """
+import atexit
 import logging
+import queue
 import sys
-from pathlib import Path
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 import colorlog
 
 from config.config import Config
 
+# All loggers share one queue drained by a single background thread, so
+# emitting a record is a cheap enqueue instead of a synchronous
+# write+flush to the console and log file inside hot loops
+_LOG_QUEUE = queue.Queue(-1)
+_listener = None
 
-def setup_logger(name: str = __name__, log_file: str = None) -> logging.Logger:
-    """
-    Setup and configure logger with color output and file logging
-    
-    Args:
-        name: Logger name
-        log_file: Optional log file name
-        
-    Returns:
-        Configured logger instance
-    """
-    logger = logging.getLogger(name)
-    
-    # Avoid adding handlers multiple times
-    if logger.handlers:
-        return logger
-    
-    logger.setLevel(getattr(logging, Config.LOG_LEVEL))
-    
+
+def _build_handlers():
+    """Build the console and file handlers the queue listener drains into"""
     # Console handler with colors
     console_handler = colorlog.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
-    
+
     console_format = colorlog.ColoredFormatter(
         '%(log_color)s%(asctime)s - %(name)s - %(levelname)s - %(message)s%(reset)s',
         datefmt='%Y-%m-%d %H:%M:%S',
@@ -45,25 +37,72 @@ def setup_logger(name: str = __name__, log_file: str = None) -> logging.Logger:
         }
     )
     console_handler.setFormatter(console_format)
-    logger.addHandler(console_handler)
-    
+
     # File handler
-    if log_file is None:
-        log_file = f"app_{datetime.now().strftime('%Y%m%d')}.log"
-    
-    log_path = Config.LOG_DIR / log_file
+    log_path = Config.LOG_DIR / f"app_{datetime.now().strftime('%Y%m%d')}.log"
     file_handler = logging.FileHandler(log_path, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
-    
+
     file_format = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(file_format)
-    logger.addHandler(file_handler)
-    
+
+    return console_handler, file_handler
+
+
+def _ensure_listener():
+    """Start the single drain thread on first logger setup"""
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_LOG_QUEUE, *_build_handlers(),
+                                  respect_handler_level=True)
+        _listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(_listener.stop)
+
+
+@lru_cache(maxsize=None)
+def setup_logger(name: str = __name__, log_file: str = None) -> logging.Logger:
+    """
+    Setup and configure logger with color output and file logging
+
+    Records go through a shared queue to one background listener thread,
+    so callers never block on console or file I/O. Memoized per (name,
+    log_file), so the repeat calls every module makes at import time
+    return the configured logger without re-checking its handlers.
+
+    Args:
+        name: Logger name
+        log_file: Optional log file name (written synchronously, in
+            addition to the shared queued handlers)
+
+    Returns:
+        Configured logger instance
+    """
+    logger = logging.getLogger(name)
+
+    # Avoid adding handlers multiple times
+    if logger.handlers:
+        return logger
+
+    logger.setLevel(getattr(logging, Config.LOG_LEVEL))
+
+    _ensure_listener()
+    logger.addHandler(QueueHandler(_LOG_QUEUE))
+
+    if log_file is not None:
+        file_handler = logging.FileHandler(Config.LOG_DIR / log_file, encoding='utf-8')
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        logger.addHandler(file_handler)
+
     return logger
 
 
 # Create default logger
-logger = setup_logger('akasa_pipeline')
\ No newline at end of file
+logger = setup_logger('akasa_pipeline')
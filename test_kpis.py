@@ -2,99 +2,140 @@
 Test KPI calculation engines
 """
 import json
-from src.kpis.table_based_kpis import table_kpi_engine
-from src.kpis.memory_based_kpis import memory_kpi_engine
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from src.kpis.table_based_kpis import get_table_engine
+from src.kpis.memory_based_kpis import get_memory_engine
+
+# The test exercises both engines, so resolve the lazy singletons up front
+table_kpi_engine = get_table_engine()
+memory_kpi_engine = get_memory_engine()
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Result envelope keys that are not metadata worth printing - built once
+# so the reporting loop does O(1) membership tests instead of scanning a
+# fresh list literal per field
+_META_EXCLUDE = frozenset({
+    'data', 'kpi_name', 'description', 'calculated_at', 'success', 'method'
+})
+
+# Sample records cost a repr per wide row dict; only format them when
+# asked so quiet CI runs skip that work entirely
+VERBOSE = os.environ.get('KPI_TEST_VERBOSE', '0') == '1'
+
+# One (kpi, method, rows, success) entry per printed result, recapped
+# as a single table at the end of the run
+_summary_rows = []
+
 
 def print_kpi_result(result, method=""):
-    """Pretty print KPI result"""
-    if result.get('success'):
-        print(f"✅ {result.get('kpi_name', 'KPI')} ({method})")
-        
-        # Print metadata
-        metadata = result.get('metadata', result)
-        for key, value in metadata.items():
-            if key not in ['data', 'kpi_name', 'description', 'calculated_at', 'success', 'method']:
-                print(f"   {key}: {value}")
-        
-        # Print sample data
-        data = result.get('data', [])
-        if data:
-            print(f"   Sample records: {min(3, len(data))} of {len(data)}")
-            for record in data[:3]:
-                print(f"      {record}")
-    else:
-        print(f"❌ Failed: {result.get('error')}")
+    """Pretty print KPI result
+
+    The report is assembled into one buffer and written with a single
+    stdout write, instead of a write-and-flush per line on a TTY.
+    """
+    if not result.get('success'):
+        _summary_rows.append((result.get('kpi_name', 'KPI'), method, 0, False))
+        sys.stdout.write(f"❌ Failed: {result.get('error')}\n\n")
+        return
+
+    lines = [f"✅ {result.get('kpi_name', 'KPI')} ({method})"]
+
+    # Metadata
+    metadata = result.get('metadata', result)
+    lines.extend(f"   {key}: {value}" for key, value in metadata.items()
+                 if key not in _META_EXCLUDE)
+
+    # Sample data. The memory engine returns split form (column names
+    # once plus row lists); rebuild dicts for the few sampled rows so
+    # both engines report the same shape. Set KPI_TEST_VERBOSE=1 to see
+    # the rows themselves - formatting them is the expensive part
+    data = result.get('data', [])
+    rows = data['rows'] if isinstance(data, dict) else data
+    if rows:
+        if VERBOSE:
+            if isinstance(data, dict):
+                samples = [dict(zip(data['columns'], row)) for row in rows[:3]]
+            else:
+                samples = rows[:3]
+            lines.append(f"   Sample records: {len(samples)} of {len(rows)}")
+            lines.extend(f"      {record}" for record in samples)
+        else:
+            lines.append(f"   Sample records: {len(rows)}")
+
+    _summary_rows.append((result.get('kpi_name', 'KPI'), method, len(rows), True))
+    sys.stdout.write("\n".join(lines) + "\n\n")
+
+
+def print_summary():
+    """Recap every KPI result as one table, formatted in a single pass"""
+    if not _summary_rows:
+        return
+
+    print("\n" + "="*60)
+    print("KPI SUMMARY")
+    print("="*60)
+    summary = pd.DataFrame(_summary_rows,
+                           columns=['kpi', 'method', 'rows', 'success'])
+    print(summary.to_string(index=False))
     print()
 
 
+# Report labels for the keys calculate_all_kpis returns
+KPI_LABELS = {
+    'repeat_customers': '1. Repeat Customers:',
+    'monthly_trends': '2. Monthly Trends:',
+    'regional_revenue': '3. Regional Revenue:',
+    'top_customers': '4. Top Customers (Last 30 Days):',
+}
+
+# Each engine's batch results, kept so test_all_kpis verifies the full
+# set without invoking the engines a second time
+_engine_results = {}
+
+
 def test_table_based_kpis():
-    """Test table-based KPIs"""
-    print("\n" + "="*60)
-    print("TABLE-BASED KPIs (SQL)")
-    print("="*60 + "\n")
-    
-    # Test individual KPIs
-    print("1. Repeat Customers:")
-    result = table_kpi_engine.calculate_kpi('repeat_customers')
-    print_kpi_result(result, "SQL")
-    
-    print("2. Monthly Trends:")
-    result = table_kpi_engine.calculate_kpi('monthly_trends')
-    print_kpi_result(result, "SQL")
-    
-    print("3. Regional Revenue:")
-    result = table_kpi_engine.calculate_kpi('regional_revenue')
-    print_kpi_result(result, "SQL")
-    
-    print("4. Top Customers (Last 30 Days):")
-    result = table_kpi_engine.calculate_kpi('top_customers', days=30, limit=10)
-    print_kpi_result(result, "SQL")
+    """Compute table-based KPIs (runs in a worker thread - no printing)"""
+    _engine_results['table'] = table_kpi_engine.calculate_all_kpis(days=30, limit=10)
+    return _engine_results['table']
 
 
 def test_memory_based_kpis():
-    """Test memory-based KPIs"""
+    """Compute memory-based KPIs (runs in a worker thread - no printing)"""
+    memory_kpi_engine.load_data()
+    _engine_results['memory'] = memory_kpi_engine.calculate_all_kpis(days=30, limit=10)
+    return _engine_results['memory']
+
+
+def print_engine_results(title, results, method):
+    """Print one engine's collected KPI results"""
     print("\n" + "="*60)
-    print("MEMORY-BASED KPIs (Pandas)")
+    print(title)
     print("="*60 + "\n")
-    
-    # Load data first
-    print("Loading data into memory...")
-    memory_kpi_engine.load_data()
-    print()
-    
-    print("1. Repeat Customers:")
-    result = memory_kpi_engine.calculate_repeat_customers()
-    print_kpi_result(result, "Pandas")
-    
-    print("2. Monthly Trends:")
-    result = memory_kpi_engine.calculate_monthly_trends()
-    print_kpi_result(result, "Pandas")
-    
-    print("3. Regional Revenue:")
-    result = memory_kpi_engine.calculate_regional_revenue()
-    print_kpi_result(result, "Pandas")
-    
-    print("4. Top Customers (Last 30 Days):")
-    result = memory_kpi_engine.calculate_top_customers_last_30_days(days=30, limit=10)
-    print_kpi_result(result, "Pandas")
+
+    for key, label in KPI_LABELS.items():
+        print(label)
+        print_kpi_result(results[key], method)
 
 
 def test_all_kpis():
-    """Test calculating all KPIs at once"""
+    """Check both engines produced the full KPI set"""
     print("\n" + "="*60)
     print("CALCULATE ALL KPIs AT ONCE")
     print("="*60 + "\n")
-    
+
+    # The batch results are already in hand from the engine tests;
+    # recompute only when this runs standalone
     print("Table-based (SQL):")
-    table_results = table_kpi_engine.calculate_all_kpis()
+    table_results = _engine_results.get('table') or table_kpi_engine.calculate_all_kpis()
     print(f"✅ Calculated {len(table_results)} KPIs\n")
-    
+
     print("Memory-based (Pandas):")
-    memory_results = memory_kpi_engine.calculate_all_kpis()
+    memory_results = _engine_results.get('memory') or memory_kpi_engine.calculate_all_kpis()
     print(f"✅ Calculated {len(memory_results)} KPIs\n")
 
 
@@ -104,10 +145,27 @@ if __name__ == "__main__":
     print("="*60)
     
     try:
-        test_table_based_kpis()
-        test_memory_based_kpis()
+        # The SQL engine waits on the database while the pandas engine
+        # spends its time in C kernels, so the two suites overlap on
+        # threads and wall time approaches the slower of the two. Each
+        # worker only collects results; printing happens afterwards so
+        # the report stays in order
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            table_future = executor.submit(test_table_based_kpis)
+            memory_future = executor.submit(test_memory_based_kpis)
+            table_results = table_future.result()
+            memory_results = memory_future.result()
+
+        print_engine_results("TABLE-BASED KPIs (SQL)", table_results, "SQL")
+        print_engine_results("MEMORY-BASED KPIs (Pandas)", memory_results, "Pandas")
         test_all_kpis()
-        
+
+        # All results are in hand - hand the engine's frames back so
+        # the report tail doesn't hold both tables resident
+        memory_kpi_engine.release()
+
+        print_summary()
+
         print("="*60)
         print("✅ ALL KPI TESTS COMPLETED!")
         print("="*60 + "\n")
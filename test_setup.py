@@ -26,11 +26,11 @@ def test_database_connection():
         print("❌ Database connection failed")
         return False
     
-    # Test tables
+    # Test tables - all three counts come back in one round-trip
     tables = ['customers', 'orders', 'customer_order_summary']
+    counts = db_manager.approx_row_counts(tables)
     for table in tables:
-        info = db_manager.get_table_info(table)
-        print(f"✅ Table '{table}': {info['row_count']} rows")
+        print(f"✅ Table '{table}': {counts[table]} rows")
     
     return True
 
@@ -38,10 +38,9 @@ def test_database_connection():
 def test_query():
     """Test a simple query"""
     logger.info("Testing database query...")
-    query = "SELECT COUNT(*) as count FROM customers"
-    result = db_manager.execute_query(query)
-    if result:
-        print(f"✅ Query test successful: {result[0]['count']} customers found")
+    count = db_manager.execute_scalar("SELECT COUNT(*) FROM customers")
+    if count is not None:
+        print(f"✅ Query test successful: {count} customers found")
         return True
     return False
 